@@ -1,17 +1,39 @@
+import math
+import os
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 import streamlit as st
-from pathlib import Path
-import plotly.express as px
+
+from catalogue import (
+    CLO_CHARTS,
+    FILTERS,
+    FacetCounts,
+    MAX,
+    RANGE,
+    SHEET_CLO,
+    SHEET_SUN,
+    SUN_CHARTS,
+    FigureCache,
+    build_clothing_comparison,
+    build_sunscreen_comparison,
+    combined_metric_figure,
+    figure_key,
+    make_labels,
+    plotly_bar,
+    ranking_table,
+)
+from catalogue.remote_images import ImageFetcher, is_url, placeholder
+from catalogue.sources import open_source
+from catalogue.store import CatalogueStore
+from catalogue.thumbnails import THUMB_WIDTH, thumbnail
 
 # ----------------- BASIC SETUP -----------------
 
 st.set_page_config(page_title="Photoprotection Catalogue", layout="wide")
 st.title("Photoprotection Catalogue")
 
-DATA_XLSX = Path(__file__).parent / "photoprotection_catalogue_template.xlsx"
-SHEET_SUN = "Sunscreens"
-SHEET_CLO = "Clothing"
-
 # Columns shown to patients in the tables (NOW includes Image)
 SUN_DISPLAY_COLS = [
     "Product Brand",
@@ -40,195 +62,36 @@ CLO_DISPLAY_COLS = [
 
 # ----------------- DATA LOADING -----------------
 
-@st.cache_data
-def load_sheet(path: Path, sheet: str) -> pd.DataFrame:
-    """Load a sheet as text, keep headers & order exactly as in Excel."""
-    df = pd.read_excel(path, sheet_name=sheet, engine="openpyxl", dtype=str)
-    df = df.fillna("")
-    df.columns = [str(c) for c in df.columns]
-    return df
-
-
-def make_label(row: pd.Series, kind: str) -> str:
-    """
-    Human-readable labels for dropdowns.
-
-    Sunscreens: Brand — Name — 50 ml
-    Clothing:   Brand — Name — Material
-    """
-    brand = str(row.get("Product Brand", "")).strip()
-    name = str(row.get("Product Name", "")).strip()
-    extra = ""
-
-    if kind == "sun":
-        vol = str(row.get("Volume (ml)", "")).strip()
-        if vol and vol.lower() != "nan":
-            extra = f" — {vol} ml"
-    elif kind == "cloth":
-        mat = str(row.get("Material", "")).strip()
-        if mat and mat.lower() != "nan":
-            extra = f" — {mat}"
-
-    label = " — ".join(x for x in [brand, name] if x)
-    if not label:
-        # Fallback: first non-empty cell from the row
-        for v in row.values:
-            if str(v).strip():
-                label = str(v)
-                break
-
-    return (label + extra).strip(" —")
-
-
-# ----------------- NUMERIC HELPER -----------------
-
-def to_float(value):
-    """
-    Safely convert spreadsheet values to float:
-
-    - '' / 'N/A' / 'na' / 'none' -> None
-    - '50+' -> 50.0
-    - '12%' -> 12.0
-    """
-    if value is None:
-        return None
-    s = str(value).strip()
-    if not s or s.lower() in {"na", "n/a", "none"}:
-        return None
-    if s.endswith("+"):
-        s = s[:-1]
-    if s.endswith("%"):
-        s = s[:-1]
-    try:
-        return float(s)
-    except ValueError:
-        return None
+# Workbook path or directory of CSV exports (see catalogue/sources.py);
+# the bundled workbook when unset
+DATA_SOURCE = os.environ.get("CATALOGUE_SOURCE", "")
 
 
-# ----------------- COMPARISON TABLE BUILDERS -----------------
-
-def build_sunscreen_comparison(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    For selected sunscreen rows, build:
-
-      Product,
-      SPF_lab (UVB),
-      UVA_PF_lab,
-      Blue_light_lab,
-      Visible_lab,
-      Price_per_ml_£
+@st.cache_resource
+def catalogue_store(location: str) -> CatalogueStore:
     """
-    if df.empty:
-        return pd.DataFrame()
-
-    col_spf_lab = "SPF (lab)"
-    col_uva_lab = "UVA Protection (Lab)"
-    col_bl_lab = "Blue Light Protection (lab)"
-    col_vis_lab = "Visible Protection (lab)"
-    col_price = "Price (£)"
-    col_vol = "Volume (ml)"
-
-    rows = []
-    for _, row in df.iterrows():
-        name = make_label(row, "sun")
-
-        spf_lab = to_float(row.get(col_spf_lab, ""))
-        uva_pf = to_float(row.get(col_uva_lab, ""))
-        bl = to_float(row.get(col_bl_lab, ""))
-        vis = to_float(row.get(col_vis_lab, ""))
-        price = to_float(row.get(col_price, ""))
-        vol = to_float(row.get(col_vol, ""))
-
-        price_per_ml = None
-        if price is not None and vol not in (None, 0):
-            price_per_ml = price / vol
-
-        rows.append(
-            {
-                "Product": name,
-                "SPF_lab (UVB)": spf_lab,
-                "UVA_PF_lab": uva_pf,
-                "Blue_light_lab": bl,
-                "Visible_lab": vis,
-                "Price_per_ml_£": price_per_ml,
-            }
-        )
-
-    return pd.DataFrame(rows)
+    The data source at location, loaded once and shared by every session.
 
-
-def build_clothing_comparison(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    For selected clothing rows, build:
-
-      Product,
-      SPF_lab (UVB),
-      UVA_PF_lab,
-      Blue_light_lab,
-      Visible_lab,
-      Price_£   (total price, not per ml)
+    A watcher thread re-parses the files when they change and swaps the
+    new sheets in; reruns pick them up without a server restart.
     """
-    if df.empty:
-        return pd.DataFrame()
-
-    col_spf_lab = "SPF (lab)"
-    col_uva_lab = "UVA Protection (Lab)"
-    col_bl_lab = "Blue Light Protection (lab)"
-    col_vis_lab = "Visible Protection (lab)"
-    col_price = "Price (£)"
-
-    rows = []
-    for _, row in df.iterrows():
-        name = make_label(row, "cloth")
-
-        spf_lab = to_float(row.get(col_spf_lab, ""))
-        uva_pf = to_float(row.get(col_uva_lab, ""))
-        bl = to_float(row.get(col_bl_lab, ""))
-        vis = to_float(row.get(col_vis_lab, ""))
-        price = to_float(row.get(col_price, ""))
-
-        rows.append(
-            {
-                "Product": name,
-                "SPF_lab (UVB)": spf_lab,
-                "UVA_PF_lab": uva_pf,
-                "Blue_light_lab": bl,
-                "Visible_lab": vis,
-                "Price_£": price,
-            }
-        )
-
-    return pd.DataFrame(rows)
+    return CatalogueStore(open_source(location)).start()
 
 
 # ----------------- PLOTTING HELPERS -----------------
 
-def plotly_bar(mdf, col, title, y_label, decimals):
-    fig = px.bar(
-        mdf,
-        x="Product",
-        y=col,
-        color="Product",
-        text_auto=f".{decimals}f",
-        height=320,
-        title=title,
-    )
-    fig.update_layout(
-        xaxis_title="Product",
-        yaxis_title=y_label,
-        legend_title="Product",
-        font=dict(size=17),
-        title_font=dict(size=20),
-    )
-    return fig
+@st.cache_resource
+def figure_cache() -> FigureCache:
+    return FigureCache()
 
 
 def plot_metric_bars(df: pd.DataFrame, col: str, title: str,
-                     y_label: str, decimals: int, target_col):
+                     y_label: str, decimals: int, target_col, version=None):
     """
     Render one grouped bar chart for a single metric column into target_col.
 
     Charts are sized for half-width columns (for side-by-side layout).
+    With the sheet's version, the figure is reused from figure_cache().
     """
     if col not in df.columns:
         return
@@ -237,80 +100,116 @@ def plot_metric_bars(df: pd.DataFrame, col: str, title: str,
     if mdf.empty:
         return
 
-    fig = plotly_bar(mdf, col, title, y_label, decimals)
+    key = figure_key(df, version, col, decimals, title, y_label)
+    fig = figure_cache().get_or_build(
+        key, lambda: plotly_bar(mdf, col, title, y_label, decimals)
+    )
     target_col.plotly_chart(fig, use_container_width=True)
 
 
-def show_sunscreen_comparison(comp: pd.DataFrame):
-    """5 charts for sunscreens: 4 protections + price per ml."""
+LAYOUT_SEPARATE = "Separate charts"
+LAYOUT_COMBINED = "Single figure"
+
+
+def show_comparison(comp: pd.DataFrame, charts: list[tuple], caption: str,
+                    layout: str = LAYOUT_SEPARATE, version=None):
+    """
+    Comparison panel for 2+ products.
+
+    LAYOUT_SEPARATE: one chart per metric, two per row.
+    LAYOUT_COMBINED: one figure with every metric as a subplot.
+
+    version, the sheet's (kind, content hash), enables the shared figure
+    cache; both workbook sheets share the workbook's hash, so kind keeps
+    their figures apart.
+    """
     if comp.empty or len(comp) < 2:
         return
 
     st.markdown("### Comparison panel")
-    st.caption(
-        "Comparing SPF (lab, UVB), UVA PF (lab), blue & visible lab measures, "
-        "and cost per ml for selected sunscreens."
-    )
+    st.caption(caption)
 
-    # Row 1 (two plots)
-    r1c1, r1c2 = st.columns(2)
-    plot_metric_bars(comp, "SPF_lab (UVB)",
-                     "SPF (lab) – UVB protection", "SPF (lab)", 1, r1c1)
-    plot_metric_bars(comp, "UVA_PF_lab",
-                     "UVA Protection (Lab) – PF", "UVA PF (lab)", 1, r1c2)
+    if layout == LAYOUT_COMBINED:
+        key = figure_key(comp, version, LAYOUT_COMBINED, tuple(charts))
+        fig = figure_cache().get_or_build(
+            key, lambda: combined_metric_figure(comp, charts)
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        return
 
-    # Row 2 (two plots)
-    r2c1, r2c2 = st.columns(2)
-    plot_metric_bars(comp, "Blue_light_lab",
-                     "Blue light Protection (lab)", "Value", 2, r2c1)
-    plot_metric_bars(comp, "Visible_lab",
-                     "Visible light Protection (lab)", "Value", 2, r2c2)
+    # Two plots per row; a trailing single plot takes half the width
+    for i in range(0, len(charts), 2):
+        targets = st.columns(2)
+        for (col, title, y_label, decimals), target in zip(charts[i:i + 2], targets):
+            plot_metric_bars(comp, col, title, y_label, decimals, target,
+                             version)
 
-    # Row 3 (single plot spanning)
-    r3c1, _ = st.columns([1, 1])
-    plot_metric_bars(comp, "Price_per_ml_£",
-                     "Price per ml (£)", "£ per ml", 3, r3c1)
 
+def show_sunscreen_comparison(comp: pd.DataFrame, layout: str = LAYOUT_SEPARATE,
+                              version=None):
+    """5 charts for sunscreens: 4 protections + price per ml."""
+    show_comparison(
+        comp,
+        SUN_CHARTS,
+        "Comparing SPF (lab, UVB), UVA PF (lab), blue & visible lab measures, "
+        "and cost per ml for selected sunscreens.",
+        layout,
+        version,
+    )
 
-def show_clothing_comparison(comp: pd.DataFrame):
-    """5 charts for clothing: 4 protections + price (£)."""
-    if comp.empty or len(comp) < 2:
-        return
 
-    st.markdown("### Comparison panel")
-    st.caption(
+def show_clothing_comparison(comp: pd.DataFrame, layout: str = LAYOUT_SEPARATE,
+                             version=None):
+    """5 charts for clothing: 4 protections + price (£)."""
+    show_comparison(
+        comp,
+        CLO_CHARTS,
         "Comparing SPF (lab, UVB), UVA PF (lab), blue & visible lab measures, "
-        "and total price (£) for selected garments."
+        "and total price (£) for selected garments.",
+        layout,
+        version,
     )
 
-    # Row 1
-    r1c1, r1c2 = st.columns(2)
-    plot_metric_bars(comp, "SPF_lab (UVB)",
-                     "SPF (lab) – UVB protection", "SPF (lab)", 1, r1c1)
-    plot_metric_bars(comp, "UVA_PF_lab",
-                     "UVA Protection (Lab) – PF", "UVA PF (lab)", 1, r1c2)
 
-    # Row 2
-    r2c1, r2c2 = st.columns(2)
-    plot_metric_bars(comp, "Blue_light_lab",
-                     "Blue light Protection (lab)", "Value", 2, r2c1)
-    plot_metric_bars(comp, "Visible_lab",
-                     "Visible light Protection (lab)", "Value", 2, r2c2)
+# ----------------- IMAGE STRIP (WORKING VERSION) -----------------
 
-    # Row 3 (price only)
-    r3c1, _ = st.columns([1, 1])
-    plot_metric_bars(comp, "Price_£",
-                     "Price (£)", "£", 2, r3c1)
+THUMBS_PER_ROW = 6
 
 
-# ----------------- IMAGE STRIP (WORKING VERSION) -----------------
+@st.cache_resource
+def image_fetcher() -> ImageFetcher:
+    """One fetcher (thread pool + disk cache) shared by every session."""
+    return ImageFetcher()
+
+
+def resolve_image(img_ref: str, remote: dict):
+    """
+    Local file to show for an Image cell, or None.
+
+    URLs come from the prefetched remote dict (placeholder if they failed);
+    everything is served through its cached thumbnail when possible.
+    """
+    if is_url(img_ref):
+        path = remote.get(img_ref)
+        if path is None:
+            return placeholder()
+    else:
+        # treat as relative to app.py
+        path = Path(__file__).parent / img_ref
+    return thumbnail(path) or path
 
-def show_product_images(df: pd.DataFrame, kind: str):
+
+def show_product_images(df: pd.DataFrame, kind: str,
+                        labels: pd.Series | None = None,
+                        per_row: int = THUMBS_PER_ROW):
     """
     Display small thumbnails for the selected rows, using the 'Image' column.
 
-    - Uses st.image with local paths or URLs.
     - Works reliably for your 'images/...' paths.
+    - URLs are fetched server-side, in parallel, through image_fetcher().
+    - Images are served as cached 2x thumbnails (see thumbnails.py).
+    - Laid out as a grid of per_row columns; pass one page of rows at a
+      time (see page_of) so only that page's images are resolved.
     """
     if df.empty or "Image" not in df.columns:
         return
@@ -321,39 +220,56 @@ def show_product_images(df: pd.DataFrame, kind: str):
 
     st.markdown("#### Product images")
 
-    cols = st.columns(len(df_img))
-    for col_widget, (_, row) in zip(cols, df_img.iterrows()):
+    if labels is None:
+        labels = make_labels(df_img, kind)
+
+    refs = df_img["Image"].astype(str).str.strip()
+    remote = image_fetcher().fetch_all(r for r in refs if is_url(r))
+
+    cols = []
+    for _ in range(0, len(df_img), per_row):
+        cols.extend(st.columns(per_row))
+    for col_widget, (idx, row) in zip(cols, df_img.iterrows()):
         img_ref = str(row.get("Image", "")).strip()
         if not img_ref:
             continue
 
-        # Resolve to URL or local file
-        if img_ref.lower().startswith(("http://", "https://")):
-            img_path = img_ref
-        else:
-            # treat as relative to app.py
-            img_path = Path(__file__).parent / img_ref
-
-        label = make_label(row, kind)
+        img_path = resolve_image(img_ref, remote)
+        label = labels[idx]
+        if img_path is None:
+            col_widget.write(label)
+            continue
         try:
-            col_widget.image(str(img_path), width=120, caption=label)
+            col_widget.image(str(img_path), width=THUMB_WIDTH, caption=label)
         except Exception:
             col_widget.write(label)
 
 
 # ----------------- LOAD SHEETS -----------------
 
-try:
-    suns = load_sheet(DATA_XLSX, SHEET_SUN)
-except Exception as e:
-    suns = pd.DataFrame()
-    st.error(f"Could not load sheet '{SHEET_SUN}' from {DATA_XLSX.name}: {e}")
-
-try:
-    cloth = load_sheet(DATA_XLSX, SHEET_CLO)
-except Exception as e:
-    cloth = pd.DataFrame()
-    st.error(f"Could not load sheet '{SHEET_CLO}' from {DATA_XLSX.name}: {e}")
+# One snapshot per run: a reload in the background never mixes old and
+# new data within a page
+store = catalogue_store(DATA_SOURCE)
+snapshot = store.snapshot()
+sheets = snapshot.sheets
+source_name = store.source.name
+if snapshot.error:
+    st.error(f"Could not load {source_name}: {snapshot.error}")
+
+if st.session_state.get("data_version", snapshot.version) != snapshot.version:
+    st.toast(f"Catalogue updated from {source_name}")
+st.session_state["data_version"] = snapshot.version
+
+suns = sheets.get(SHEET_SUN)
+cloth = sheets.get(SHEET_CLO)
+for name, data in [(SHEET_SUN, suns), (SHEET_CLO, cloth)]:
+    if name in snapshot.errors:
+        kept = " (showing the last version that loaded)" if data else ""
+        st.error(f"Could not load sheet '{name}' from {source_name}: "
+                 f"{snapshot.errors[name]}{kept}")
+    elif sheets and data is None:
+        st.error(f"Could not load sheet '{name}' from {source_name}: "
+                 "sheet not found")
 
 
 # ----------------- HELPER: SAFE COLUMN SELECTION -----------------
@@ -366,23 +282,248 @@ def safe_select_columns(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
     return df[present].copy()
 
 
+# ----------------- HELPER: DATA ISSUES -----------------
+
+def show_issues(sheet):
+    """Validation report of a sheet (see catalogue/schema.py), collapsed."""
+    if sheet.issues is None or sheet.issues.empty:
+        return
+    with st.expander(f"Data issues in this sheet ({len(sheet.issues)})"):
+        st.caption("Cells that are missing, out of range or unreadable. "
+                   "Unreadable numbers are blank in the comparisons.")
+        st.dataframe(sheet.issues, use_container_width=True, hide_index=True)
+
+
+# ----------------- HELPER: SEARCH -----------------
+
+def search_rows(sheet, key: str):
+    """
+    Row positions matching the tab's search box; None when it's empty.
+
+    Words are matched as prefixes against names, brands, materials,
+    coatings, ingredients and claims through sheet.search; misspelt
+    brand / name words fall back to their closest spelling.
+    """
+    query = st.text_input(
+        "Search products, ingredients and claims",
+        key=f"{key}_search",
+        placeholder="e.g. zinc, fragrance, UPF",
+    )
+    if not query.strip():
+        return None
+    rows = sheet.search.search(query)
+    fixed = sheet.search.corrections(query)
+    note = "; ".join(f"“{word}” → {', '.join(terms)}"
+                     for word, terms in fixed.items())
+    st.caption(f"{len(rows)} matching products"
+               + (f" (showing close matches: {note})" if note else ""))
+    return rows
+
+
+def ingredient_rows(sheet, key: str):
+    """
+    Row positions passing the ingredient include / exclude filter; None
+    when nothing is chosen or the sheet has no ingredient lists.
+
+    Filters are bitmap operations on sheet.ingredients, not text scans.
+    """
+    index = sheet.ingredients
+    if not index.names:
+        return None
+
+    def label(name: str) -> str:
+        return f"{name.title()} ({index.count(name)})"
+
+    with st.expander("Filter by ingredient / UV filter"):
+        include_col, exclude_col = st.columns(2)
+        any_of = include_col.multiselect("Contains any of", index.names,
+                                         format_func=label,
+                                         key=f"{key}_ingredients_any")
+        none_of = exclude_col.multiselect("Contains none of", index.names,
+                                          format_func=label,
+                                          key=f"{key}_ingredients_none")
+        if none_of:
+            st.caption("Products without an ingredients list are left out "
+                       "when excluding ingredients.")
+    if not any_of and not none_of:
+        return None
+    rows = index.match(any_of=any_of, none_of=none_of)
+    st.caption(f"{len(rows)} products pass the ingredient filter")
+    return rows
+
+
+def range_rows(sheet, key: str, title: str):
+    """
+    Row positions passing the sheet's sidebar range filters; None when no
+    bound is set.
+
+    Each bound is a searchsorted on sheet.ranges (sorted per metric), so
+    a change costs O(log n + k), not a mask over every row.
+    """
+    bounds = {}
+    with st.sidebar.expander(title):
+        for f in FILTERS[sheet.kind]:
+            def bound(label, suffix, target=st):
+                return target.number_input(label, min_value=0.0, value=None,
+                                           step=f.step,
+                                           key=f"{key}_{suffix}_{f.metric}")
+            if f.bound == RANGE:
+                low_col, high_col = st.columns(2)
+                bounds[f.metric] = (bound(f"{f.title} from", "low", low_col),
+                                    bound("to", "high", high_col))
+            elif f.bound == MAX:
+                bounds[f.metric] = (None, bound(f.title, "high"))
+            else:
+                bounds[f.metric] = (bound(f.title, "low"), None)
+        rows = sheet.ranges.select(bounds)
+        if rows is not None:
+            st.caption(f"{len(rows)} products within these ranges")
+    return rows
+
+
+def show_facets(sheet, rows, key: str, n: int = 8):
+    """
+    Counts per brand, shop, material and SPF / UPF band of the rows shown
+    (None = every row).
+
+    A FacetCounts kept in the session updates the previous counts by the
+    rows that entered or left the result, over codes factorised once in
+    sheet.facets, rather than running value_counts on every rerun.
+    """
+    state = st.session_state.get(f"{key}_facets")
+    if state is None or state.index is not sheet.facets:
+        state = st.session_state[f"{key}_facets"] = FacetCounts(sheet.facets)
+    top = sheet.facets.top(state.update(rows), n)
+    if not top:
+        return
+    with st.expander("Breakdown of matching products"):
+        for col, (title, values) in zip(st.columns(len(top)), top.items()):
+            col.markdown(f"**{title}**")
+            col.markdown("\n".join(f"- {value} ({count})"
+                                   for value, count in values)
+                         or "_none_")
+
+
+def narrow(*selections):
+    """Intersection of row selections, where None means every row."""
+    rows = None
+    for more in selections:
+        if more is None:
+            continue
+        rows = more if rows is None else np.intersect1d(rows, more,
+                                                        assume_unique=True)
+    return rows
+
+
+def select_options(sheet, rows, key: str) -> list[str]:
+    """Keys offered by the multiselect: the current selection, then rows."""
+    chosen = [k for k in st.session_state.get(key, []) if k in sheet.positions]
+    pool = sheet.keys if rows is None else sheet.keys.iloc[rows]
+    return list(dict.fromkeys([*chosen, *pool]))
+
+
+# ----------------- HELPER: PAGINATION -----------------
+
+PAGE_SIZES = [25, 50, 100, 250]
+
+
+def page_of(df: pd.DataFrame, key: str) -> pd.DataFrame:
+    """
+    The current page of df, with page-size / page widgets under key.
+
+    Widgets only appear when df doesn't fit on the smallest page, so
+    render cost stays bounded by the page size, not the catalogue size.
+    """
+    if len(df) <= PAGE_SIZES[0]:
+        return df
+
+    size_col, page_col, info_col = st.columns([1, 1, 2])
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES,
+                                   key=f"{key}_page_size")
+    n_pages = math.ceil(len(df) / page_size)
+    if st.session_state.get(f"{key}_page", 1) > n_pages:
+        st.session_state[f"{key}_page"] = n_pages
+    page = page_col.number_input("Page", min_value=1, max_value=n_pages,
+                                 step=1, key=f"{key}_page")
+    info_col.caption(f"{len(df)} products · page {page} of {n_pages}")
+
+    start = (page - 1) * page_size
+    return df.iloc[start:start + page_size]
+
+
+# ----------------- HELPER: RECOMMENDATIONS -----------------
+
+RANK_TOP_N = [10, 25, 50, 100]
+
+
+def show_recommendations(sheet, key: str):
+    """
+    Top products of the whole sheet for the user's weights and thresholds.
+
+    Scores come from sheet.ranking (precomputed sorted arrays), so each
+    rerun is a vectorised top-N query, whatever the catalogue size.
+    """
+    index = sheet.ranking
+    st.caption("Weight what matters (0 = ignore) and optionally set limits. "
+               "Each measure is scored by its percentile in the sheet; "
+               "cheaper is better for price.")
+
+    weights, thresholds = {}, {}
+    for c, target in zip(index.criteria, st.columns(len(index.criteria))):
+        with target:
+            weights[c.metric] = st.slider(c.title, 0, 5, 1,
+                                          key=f"{key}_w_{c.metric}")
+            bound = st.number_input(
+                "At most" if c.lower_is_better else "At least",
+                min_value=0.0,
+                value=None,
+                key=f"{key}_t_{c.metric}",
+            )
+            if bound is not None:
+                thresholds[c.metric] = ((None, bound) if c.lower_is_better
+                                        else (bound, None))
+
+    n = st.selectbox("Show top", RANK_TOP_N, key=f"{key}_top_n")
+    positions, scores = index.top(weights, thresholds, n)
+    if not len(positions):
+        st.info("No products meet these limits.")
+        return
+
+    st.dataframe(
+        ranking_table(sheet, positions, scores).drop(columns="Key"),
+        use_container_width=True,
+        hide_index=True,
+    )
+
+
 # ----------------- UI: TABS -----------------
 
-tab1, tab2 = st.tabs(["Sunscreens", "Clothing"])
+chart_layout = st.sidebar.radio(
+    "Comparison charts",
+    [LAYOUT_SEPARATE, LAYOUT_COMBINED],
+    key="chart_layout",
+    help="Single figure sends one chart instead of five to the browser.",
+)
+
+tab1, tab2, tab3 = st.tabs(["Sunscreens", "Clothing", "Recommend"])
 
 
 # ---- Sunscreens tab ----
 with tab1:
-    if suns.empty:
+    if suns is None or suns.empty:
         st.info("No sunscreen data yet. Add rows to the 'Sunscreens' sheet.")
     else:
-        labels_sun = suns.apply(lambda r: make_label(r, "sun"), axis=1)
-
+        matches_sun = narrow(search_rows(suns, key="sun"),
+                             ingredient_rows(suns, key="sun"),
+                             range_rows(suns, key="sun",
+                                        title="Sunscreen filters"))
+        show_facets(suns, matches_sun, key="sun")
         left, right = st.columns([2, 1])
         with left:
             chosen_sun = st.multiselect(
                 "Choose up to 3 products to compare:",
-                options=labels_sun.tolist(),
+                options=select_options(suns, matches_sun, "sun_select"),
+                format_func=suns.label,
                 max_selections=3,
                 key="sun_select",
             )
@@ -394,40 +535,47 @@ with tab1:
             )
 
         if show_all_sun:
-            view_sun = suns
+            view_sun = (suns.df if matches_sun is None
+                        else suns.df.iloc[matches_sun])
         else:
-            mask = labels_sun.isin(chosen_sun)
-            view_sun = suns.loc[mask, suns.columns.tolist()]
+            view_sun = suns.rows(chosen_sun)
 
         # Comparison plots (only when 2–3 products specifically selected)
         if not show_all_sun and 1 < len(view_sun) <= 3:
-            comp_sun = build_sunscreen_comparison(view_sun)
-            show_sunscreen_comparison(comp_sun)
+            comp_sun = build_sunscreen_comparison(view_sun, suns.labels,
+                                                  suns.keys)
+            show_sunscreen_comparison(comp_sun, chart_layout,
+                                      (suns.kind, suns.version))
 
-        # Thumbnails for the selected products
-        show_product_images(view_sun, kind="sun")
+        # One page of the view: thumbnails + table
+        page_sun = page_of(view_sun, key="sun")
+        show_product_images(page_sun, kind="sun", labels=suns.labels)
 
         # Patient-facing table
-        view_sun_display = safe_select_columns(view_sun, SUN_DISPLAY_COLS)
+        view_sun_display = safe_select_columns(page_sun, SUN_DISPLAY_COLS)
         st.dataframe(
             view_sun_display,
             use_container_width=True,
             hide_index=True,
         )
+        show_issues(suns)
 
 
 # ---- Clothing tab ----
 with tab2:
-    if cloth.empty:
+    if cloth is None or cloth.empty:
         st.info("No clothing data yet. Add rows to the 'Clothing' sheet.")
     else:
-        labels_cloth = cloth.apply(lambda r: make_label(r, "cloth"), axis=1)
-
+        matches_cloth = narrow(search_rows(cloth, key="cloth"),
+                               range_rows(cloth, key="cloth",
+                                          title="Clothing filters"))
+        show_facets(cloth, matches_cloth, key="cloth")
         left, right = st.columns([2, 1])
         with left:
             chosen_cloth = st.multiselect(
                 "Choose up to 3 garments to compare:",
-                options=labels_cloth.tolist(),
+                options=select_options(cloth, matches_cloth, "cloth_select"),
+                format_func=cloth.label,
                 max_selections=3,
                 key="cloth_select",
             )
@@ -439,20 +587,36 @@ with tab2:
             )
 
         if show_all_cloth:
-            view_cloth = cloth
+            view_cloth = (cloth.df if matches_cloth is None
+                          else cloth.df.iloc[matches_cloth])
         else:
-            mask = labels_cloth.isin(chosen_cloth)
-            view_cloth = cloth.loc[mask, cloth.columns.tolist()]
+            view_cloth = cloth.rows(chosen_cloth)
 
         if not show_all_cloth and 1 < len(view_cloth) <= 3:
-            comp_cloth = build_clothing_comparison(view_cloth)
-            show_clothing_comparison(comp_cloth)
+            comp_cloth = build_clothing_comparison(view_cloth, cloth.labels,
+                                                   cloth.keys)
+            show_clothing_comparison(comp_cloth, chart_layout,
+                                     (cloth.kind, cloth.version))
 
-        show_product_images(view_cloth, kind="cloth")
+        page_cloth = page_of(view_cloth, key="cloth")
+        show_product_images(page_cloth, kind="cloth", labels=cloth.labels)
 
-        view_cloth_display = safe_select_columns(view_cloth, CLO_DISPLAY_COLS)
+        view_cloth_display = safe_select_columns(page_cloth, CLO_DISPLAY_COLS)
         st.dataframe(
             view_cloth_display,
             use_container_width=True,
             hide_index=True,
         )
+        show_issues(cloth)
+
+
+# ---- Recommend tab ----
+with tab3:
+    ranked = {name: data for name, data in [(SHEET_SUN, suns), (SHEET_CLO, cloth)]
+              if data is not None and not data.empty}
+    if not ranked:
+        st.info("No products to rank yet.")
+    else:
+        which = st.radio("Rank", list(ranked), horizontal=True,
+                         key="rank_sheet")
+        show_recommendations(ranked[which], key=f"rank_{ranked[which].kind}")
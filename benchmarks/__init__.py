@@ -0,0 +1 @@
+"""Benchmarks for the catalogue engine; run with `python -m benchmarks.run`."""
@@ -0,0 +1,303 @@
+"""
+Wall time and peak memory of each catalogue stage at several sizes.
+
+    python -m benchmarks.run                      # 100 and 10k rows
+    python -m benchmarks.run --sizes 100 10000 100000
+    python -m benchmarks.run --check              # compare with baseline.json
+    python -m benchmarks.run --save-baseline      # overwrite baseline.json
+
+Times are the best of --repeat runs. Memory is measured in separate runs
+so it doesn't distort the timings: py_mb is the tracemalloc peak (Python
+and numpy/pandas allocations only), rss_mb how far the peak resident set
+grew while the stage ran (every allocation, including Arrow and calamine;
+Linux only, since it resets the kernel's peak RSS mark). --check exits
+non-zero when a stage is slower / larger than the baseline by more than
+the tolerances below, so regressions show up in review.
+
+baseline.json holds 100, 10k and 100k rows; the 100k run takes about
+40 minutes on one core, so it is not in the default sizes.
+"""
+
+import argparse
+import gc
+import json
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from catalogue import (
+    CACHE_DIR,
+    SHEET_CLO,
+    SHEET_SUN,
+    SUN_CHARTS,
+    USED_COLUMNS,
+    build_sheet,
+    build_sunscreen_comparison,
+    combined_metric_figure,
+    make_labels,
+    plotly_bar,
+    read_sheet,
+    read_sheets,
+    to_float,
+    workbook_key,
+)
+from catalogue.loader import (
+    BASE_DIR,
+    ENGINE_CALAMINE,
+    ENGINE_PANDAS,
+    ENGINE_STREAM,
+    clear_sidecars,
+    default_engine,
+)
+from catalogue.facets import FacetCounts, FacetIndex
+from catalogue.ingredients import IngredientIndex
+from catalogue.ranges import SortedIndex
+from catalogue.ranking import RankIndex
+from catalogue.schema import SUN_SCHEMA, add_typed_columns
+from catalogue.search import SearchIndex
+from catalogue.sheet import update_sheet
+from catalogue.synth import catalogue, write_catalogue
+from catalogue.thumbnails import thumbnail
+
+BENCH_DIR = CACHE_DIR / "bench"
+BASELINE = Path(__file__).parent / "baseline.json"
+DEFAULT_SIZES = [100, 10_000]
+SCALAR_LIMIT = 1_000    # to_float per cell is only timed on this many cells
+PAGE = 25               # rows on one page of the UI (table + image strip)
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.25
+RSS_SLACK_MB = 2.0      # RSS grows in pages and malloc arenas; ignore noise
+
+
+def synthetic_workbook(n_rows: int, out_dir: Path) -> Path:
+    """Write (once) and return a synthetic workbook with n_rows per sheet."""
+    path = out_dir / f"synthetic-{n_rows}.xlsx"
+    if not path.exists():
+        write_catalogue(catalogue(n_rows), path, "xlsx")
+    return path
+
+
+def stages(path: Path):
+    """(name, setup, fn) for every stage; setup runs untimed before fn."""
+    key = workbook_key(path)
+    raw = read_sheet(path, SHEET_SUN, key)
+    # The sheet as the app ingests it: typed columns, keys, labels, issues
+    sheet = update_sheet(None, raw, "sun", key["sha256"])
+    df = sheet.df
+    spf = raw["SPF (lab)"]
+    # A few rows appended by a curator, as a reload sees them
+    grown = pd.concat([raw, raw.head(PAGE).assign(**{"Product Name": "New"})],
+                      ignore_index=True)
+    few = build_sunscreen_comparison(df.head(3), sheet.labels, sheet.keys)
+    weights = {c.metric: 1 for c in sheet.ranking.criteria}
+    thresholds = {"SPF_lab (UVB)": (30, None)}
+    index = SearchIndex.build(df)
+    allergens = {"any_of": ["zinc oxide", "tinosorb s"],
+                 "none_of": ["octocrylene"]}
+    bounds = {"SPF_lab (UVB)": (30, None), "UVA_PF_lab": (10, None),
+              "Price_per_ml_£": (None, 0.5), "Volume_ml": (30, 100)}
+    # Facets of the range-filtered rows, then a tighter filter drops a tenth
+    filtered = sheet.ranges.select(bounds)
+    narrowed = filtered[filtered % 10 != 0]
+    counts = FacetCounts(sheet.facets)
+
+    def facets_before():
+        counts.update(filtered)
+
+    page = df.head(PAGE)
+    # Image refs are relative to the app, not to the synthetic workbook
+    images = [BASE_DIR / ref for ref in page["Image"]
+              if ref and not ref.startswith("http")]
+
+    def cold_setup():
+        clear_sidecars(path)
+
+    def cold_load(engine, columns=None):
+        return lambda: read_sheet(path, SHEET_SUN, key, columns, engine)
+
+    loads = [
+        ("load_sheet (openpyxl)", cold_setup, cold_load(ENGINE_PANDAS)),
+        ("load_sheet (streaming, used cols)", cold_setup,
+         cold_load(ENGINE_STREAM, USED_COLUMNS)),
+    ]
+    if default_engine() == ENGINE_CALAMINE:
+        loads.append(("load_sheet (calamine, used cols)", cold_setup,
+                      cold_load(ENGINE_CALAMINE, USED_COLUMNS)))
+    # One pass vs two with each engine the app can default to
+    for engine in dict.fromkeys([ENGINE_STREAM, default_engine()]):
+        name = "streaming" if engine == ENGINE_STREAM else engine
+        loads += [
+            (f"load both sheets (two passes, {name})", cold_setup,
+             lambda engine=engine: [
+                 read_sheet(path, s, key, USED_COLUMNS, engine)
+                 for s in (SHEET_SUN, SHEET_CLO)]),
+            (f"load both sheets (one pass, {name})", cold_setup,
+             lambda engine=engine: read_sheets(
+                 path, [SHEET_SUN, SHEET_CLO], key, USED_COLUMNS, engine)),
+        ]
+
+    return loads + [
+        ("load_sheet (sidecar)", None,
+         lambda: read_sheet(path, SHEET_SUN, key)),
+        ("to_float (per cell)", None,
+         lambda: [to_float(v) for v in spf.iloc[:SCALAR_LIMIT]]),
+        ("add_typed_columns (numbers + dates)", None,
+         lambda: add_typed_columns(raw, SUN_SCHEMA)),
+        ("make_labels", None, lambda: make_labels(df, "sun")),
+        ("build_sheet (keys + labels + issues)", None,
+         lambda: build_sheet(df, "sun", key["sha256"])),
+        ("update_sheet (first load)", None,
+         lambda: update_sheet(None, raw, "sun", key["sha256"])),
+        ("re-ingest appended rows (full)", None,
+         lambda: build_sheet(add_typed_columns(grown, SUN_SCHEMA), "sun")),
+        ("re-ingest appended rows (incremental)", None,
+         lambda: update_sheet(sheet, grown, "sun")),
+        ("re-ingest unchanged sheet (incremental)", None,
+         lambda: update_sheet(sheet, raw, "sun")),
+        ("build_sunscreen_comparison (all)", None,
+         lambda: build_sunscreen_comparison(df, sheet.labels, sheet.keys)),
+        ("SortedIndex (whole sheet)", None,
+         lambda: SortedIndex.for_sheet(df, "sun")),
+        ("range filter (4 bounds)", None,
+         lambda: sheet.ranges.select(bounds)),
+        ("RankIndex (whole sheet)", None, lambda: RankIndex(df, "sun")),
+        ("rank top 25 (whole sheet)", None,
+         lambda: sheet.ranking.top(weights, thresholds, PAGE)),
+        ("SearchIndex (whole sheet)", None, lambda: SearchIndex.build(df)),
+        ("search (two prefixes)", None, lambda: index.search("octo meth")),
+        ("search (one letter)", None, lambda: index.search("a")),
+        ("search (misspelt brand)", None,
+         lambda: index.search("la roche posey")),
+        ("IngredientIndex (whole sheet)", None, lambda: IngredientIndex(df)),
+        ("ingredient filter (any + none)", None,
+         lambda: sheet.ingredients.match(**allergens)),
+        ("FacetIndex (whole sheet)", None, lambda: FacetIndex(df, "sun")),
+        ("facet counts (filter changed)", facets_before,
+         lambda: counts.update(narrowed)),
+        ("facet counts (value_counts, reference)", None,
+         lambda: [df[f.column].iloc[narrowed].value_counts()
+                  for f in sheet.facets.facets]),
+        ("plotly_bar (3 products)", None,
+         lambda: plotly_bar(few, "SPF_lab (UVB)", "SPF", "SPF", 1)),
+        ("combined_metric_figure (3 products)", None,
+         lambda: combined_metric_figure(few, SUN_CHARTS)),
+        ("image strip (one page)", None,
+         lambda: [thumbnail(p) for p in images]),
+    ]
+
+
+def _status_mb(field: str) -> float:
+    """A memory field of /proc/self/status (VmRSS, VmHWM), in MB."""
+    with open("/proc/self/status", encoding="ascii") as fh:
+        return int(re.search(rf"{field}:\s+(\d+)", fh.read()).group(1)) / 2**10
+
+
+def rss_growth(setup, fn) -> float | None:
+    """
+    MB the resident set grew by at its peak while fn ran; None where the
+    peak can't be reset (not Linux).
+
+    Memory freed by earlier runs is returned first (gc, Arrow's pool), and
+    writing 5 to clear_refs resets VmHWM to the current RSS.
+    """
+    if setup:
+        setup()
+    gc.collect()
+    pa.default_memory_pool().release_unused()
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as fh:
+            fh.write("5")
+        before = _status_mb("VmRSS")
+    except OSError:
+        return None
+    fn()
+    return round(max(_status_mb("VmHWM") - before, 0.0), 3)
+
+
+def measure(setup, fn, repeat: int) -> dict:
+    best = float("inf")
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(best, 6), "py_mb": round(peak / 2**20, 3),
+            "rss_mb": rss_growth(setup, fn)}
+
+
+def run(sizes, repeat: int) -> dict:
+    results = {}
+    for n in sizes:
+        path = synthetic_workbook(n, BENCH_DIR)
+        results[str(n)] = {}
+        for name, setup, fn in stages(path):
+            r = measure(setup, fn, repeat)
+            results[str(n)][name] = r
+            rss = "-" if r["rss_mb"] is None else f"{r['rss_mb']:.2f}"
+            print(f"{n:>8} rows  {name:<40} {r['seconds'] * 1000:>10.2f} ms"
+                  f"  {r['py_mb']:>9.2f} MB py  {rss:>9} MB rss", flush=True)
+    return results
+
+
+def regressions(results: dict, baseline: dict) -> list[str]:
+    found = []
+    for n, by_stage in results.items():
+        for name, r in by_stage.items():
+            base = baseline.get(n, {}).get(name)
+            if base is None:
+                continue
+            if r["seconds"] > base["seconds"] * TIME_TOLERANCE:
+                found.append(f"{n} rows / {name}: {r['seconds']:.4f}s "
+                             f"vs baseline {base['seconds']:.4f}s")
+            if r["py_mb"] > base["py_mb"] * MEMORY_TOLERANCE:
+                found.append(f"{n} rows / {name}: {r['py_mb']:.2f} MB py "
+                             f"vs baseline {base['py_mb']:.2f} MB")
+            if (r["rss_mb"] is not None and base.get("rss_mb") is not None
+                    and r["rss_mb"] > base["rss_mb"] * MEMORY_TOLERANCE
+                    + RSS_SLACK_MB):
+                found.append(f"{n} rows / {name}: {r['rss_mb']:.2f} MB rss "
+                             f"vs baseline {base['rss_mb']:.2f} MB")
+    return found
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", type=Path, help="write results as JSON")
+    parser.add_argument("--check", action="store_true",
+                        help="fail on regressions against baseline.json")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store these results as baseline.json")
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2) + "\n")
+    if args.save_baseline:
+        merged = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+        merged.update(results)
+        BASELINE.write_text(json.dumps(merged, indent=2) + "\n")
+    if args.check and BASELINE.exists():
+        found = regressions(results, json.loads(BASELINE.read_text()))
+        for line in found:
+            print("REGRESSION", line)
+        return 1 if found else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""
+Headless catalogue engine: loading, parsing, labelling and comparisons.
+
+Nothing here imports Streamlit, so the engine can be used from workers,
+benchmarks and batch jobs; app.py is the UI layer on top.
+"""
+
+from .charts import (
+    CLO_CHARTS,
+    SUN_CHARTS,
+    FigureCache,
+    combined_metric_figure,
+    figure_key,
+    plotly_bar,
+)
+from .compare import (
+    CLO_METRICS,
+    SUN_METRICS,
+    Metric,
+    build_clothing_comparison,
+    build_comparison,
+    build_sunscreen_comparison,
+)
+from .facets import (
+    CLO_FACETS,
+    FACETS,
+    SUN_FACETS,
+    Facet,
+    FacetCounts,
+    FacetIndex,
+)
+from .ingredients import INCI_ALIASES, IngredientIndex, parse_ingredients
+from .labels import make_keys, make_label, make_labels, unique_labels
+from .loader import (
+    CACHE_DIR,
+    DATA_XLSX,
+    SHEET_CLO,
+    SHEET_SUN,
+    read_sheet,
+    read_sheets,
+    workbook_key,
+)
+from .parsing import num_col, numeric, to_float, to_float_series
+from .ranges import (
+    CLO_FILTERS,
+    FILTERS,
+    MAX,
+    MIN,
+    RANGE,
+    SUN_FILTERS,
+    RangeFilter,
+    SortedIndex,
+)
+from .ranking import CLO_CRITERIA, SUN_CRITERIA, Criterion, RankIndex, ranking_table
+from .schema import CLO_SCHEMA, SCHEMAS, SUN_SCHEMA, Field, validate
+from .search import SEARCH_COLUMNS, SearchIndex, tokenize
+from .sheet import (
+    CATALOGUE_SHEETS,
+    USED_COLUMNS,
+    SheetData,
+    build_sheet,
+    load_catalogue,
+)
+from .sources import CsvColumn, CsvSource, WorkbookSource, open_source
+
+__all__ = [
+    "CLO_CHARTS",
+    "SUN_CHARTS",
+    "FigureCache",
+    "combined_metric_figure",
+    "figure_key",
+    "plotly_bar",
+    "CLO_METRICS",
+    "SUN_METRICS",
+    "Metric",
+    "build_clothing_comparison",
+    "build_comparison",
+    "build_sunscreen_comparison",
+    "CLO_FACETS",
+    "FACETS",
+    "SUN_FACETS",
+    "Facet",
+    "FacetCounts",
+    "FacetIndex",
+    "INCI_ALIASES",
+    "IngredientIndex",
+    "parse_ingredients",
+    "make_keys",
+    "make_label",
+    "make_labels",
+    "unique_labels",
+    "CACHE_DIR",
+    "DATA_XLSX",
+    "SHEET_CLO",
+    "SHEET_SUN",
+    "read_sheet",
+    "read_sheets",
+    "workbook_key",
+    "num_col",
+    "numeric",
+    "to_float",
+    "to_float_series",
+    "CLO_FILTERS",
+    "FILTERS",
+    "MAX",
+    "MIN",
+    "RANGE",
+    "SUN_FILTERS",
+    "RangeFilter",
+    "SortedIndex",
+    "CLO_CRITERIA",
+    "SUN_CRITERIA",
+    "Criterion",
+    "RankIndex",
+    "ranking_table",
+    "CLO_SCHEMA",
+    "SCHEMAS",
+    "SUN_SCHEMA",
+    "Field",
+    "validate",
+    "SEARCH_COLUMNS",
+    "SearchIndex",
+    "tokenize",
+    "CATALOGUE_SHEETS",
+    "USED_COLUMNS",
+    "SheetData",
+    "build_sheet",
+    "load_catalogue",
+    "CsvColumn",
+    "CsvSource",
+    "WorkbookSource",
+    "open_source",
+]
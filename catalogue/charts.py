@@ -0,0 +1,143 @@
+"""Plotly figures for comparison tables, and a shared figure cache."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+# (column, title, y label, decimals) for each chart of a comparison panel
+SUN_CHARTS = [
+    ("SPF_lab (UVB)", "SPF (lab) – UVB protection", "SPF (lab)", 1),
+    ("UVA_PF_lab", "UVA Protection (Lab) – PF", "UVA PF (lab)", 1),
+    ("Blue_light_lab", "Blue light Protection (lab)", "Value", 2),
+    ("Visible_lab", "Visible light Protection (lab)", "Value", 2),
+    ("Price_per_ml_£", "Price per ml (£)", "£ per ml", 3),
+]
+
+CLO_CHARTS = SUN_CHARTS[:4] + [("Price_£", "Price (£)", "£", 2)]
+
+FIGURE_CACHE_SIZE = 256
+
+
+class FigureCache:
+    """
+    Bounded LRU of built Plotly figures, shared by every session.
+
+    Keys are (sheet version, selected product keys, metric, decimals, ...),
+    so reruns and other sessions comparing the same products reuse the
+    figure. Cached figures must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = FIGURE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._figures: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build: Callable[[], go.Figure]) -> go.Figure:
+        """Cached figure for key, building (and caching) it on a miss."""
+        if key is None:
+            return build()
+        with self._lock:
+            fig = self._figures.get(key)
+            if fig is not None:
+                self._figures.move_to_end(key)
+                return fig
+
+        fig = build()
+        with self._lock:
+            self._figures[key] = fig
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return fig
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+
+def figure_key(comp: pd.DataFrame, version, *parts):
+    """
+    Cache key for a figure drawn from comp; None if comp can't be keyed.
+
+    version must identify the sheet as well as its content: keys can
+    repeat across sheets, and workbook sheets share one version.
+    """
+    if version is None or "Key" not in comp.columns:
+        return None
+    return (version, tuple(comp["Key"]), *parts)
+
+
+def plotly_bar(mdf, col, title, y_label, decimals):
+    fig = px.bar(
+        mdf,
+        x="Product",
+        y=col,
+        color="Product",
+        text_auto=f".{decimals}f",
+        height=320,
+        title=title,
+    )
+    fig.update_layout(
+        xaxis_title="Product",
+        yaxis_title=y_label,
+        legend_title="Product",
+        font=dict(size=17),
+        title_font=dict(size=20),
+    )
+    return fig
+
+
+def combined_metric_figure(df: pd.DataFrame, charts: list[tuple]) -> go.Figure:
+    """
+    All metric charts of a panel as subplots of one figure.
+
+    One trace per product and metric; traces of a product share a colour
+    and a legend entry, so the legend is drawn once for the whole panel;
+    a product's entry comes from its first bar, whichever chart that is in.
+    """
+    charts = [c for c in charts if c[0] in df.columns and df[c[0]].notna().any()]
+    n_rows = max(1, (len(charts) + 1) // 2)
+    fig = make_subplots(
+        rows=n_rows,
+        cols=2,
+        subplot_titles=[title for _, title, _, _ in charts],
+        vertical_spacing=0.35 / n_rows,
+    )
+
+    palette = px.colors.qualitative.Plotly
+    products = df["Product"].tolist()
+    in_legend = set()
+    for i, (col, _, y_label, decimals) in enumerate(charts):
+        row, col_no = i // 2 + 1, i % 2 + 1
+        for j, product in enumerate(products):
+            value = df[col].iat[j]
+            if pd.isna(value):
+                continue
+            fig.add_trace(
+                go.Bar(
+                    x=[product],
+                    y=[value],
+                    name=product,
+                    legendgroup=product,
+                    showlegend=j not in in_legend,
+                    marker_color=palette[j % len(palette)],
+                    texttemplate=f"%{{y:.{decimals}f}}",
+                ),
+                row=row,
+                col=col_no,
+            )
+            in_legend.add(j)
+        fig.update_yaxes(title_text=y_label, row=row, col=col_no)
+        fig.update_xaxes(showticklabels=False, row=row, col=col_no)
+
+    fig.update_layout(
+        height=320 * n_rows,
+        legend_title="Product",
+        font=dict(size=17),
+    )
+    fig.update_annotations(font_size=20)
+    return fig
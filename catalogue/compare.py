@@ -0,0 +1,111 @@
+"""Comparison tables: selected rows projected onto numeric metrics."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import pandas as pd
+
+from .labels import make_labels
+from .parsing import numeric, to_float_series
+
+
+@dataclass(frozen=True)
+class Metric:
+    """
+    One numeric column of a comparison table.
+
+    Either read from a sheet column (through parser) or derived from the
+    whole sheet with formula, e.g. price / volume.
+    """
+    output: str
+    column: str | None = None
+    parser: Callable[[pd.Series], pd.Series] = to_float_series
+    formula: Callable[[pd.DataFrame], pd.Series] | None = None
+
+
+def safe_ratio(num: pd.Series, den: pd.Series) -> pd.Series:
+    """num / den, with NaN wherever den is missing or zero."""
+    return num / den.where(den != 0)
+
+
+def price_per_ml(df: pd.DataFrame) -> pd.Series:
+    return safe_ratio(numeric(df, "Price (£)"), numeric(df, "Volume (ml)"))
+
+
+LAB_METRICS = [
+    Metric("SPF_lab (UVB)", "SPF (lab)"),
+    Metric("UVA_PF_lab", "UVA Protection (Lab)"),
+    Metric("Blue_light_lab", "Blue Light Protection (lab)"),
+    Metric("Visible_lab", "Visible Protection (lab)"),
+]
+
+SUN_METRICS = LAB_METRICS + [Metric("Price_per_ml_£", formula=price_per_ml)]
+
+# Clothing: total price, not per ml
+CLO_METRICS = LAB_METRICS + [Metric("Price_£", "Price (£)")]
+
+
+def metric_values(df: pd.DataFrame, metric: Metric) -> pd.Series:
+    """Whole-column values of one metric for every row of df."""
+    if metric.formula is not None:
+        return metric.formula(df)
+    if metric.parser is to_float_series:
+        return numeric(df, metric.column)
+    if metric.column in df.columns:
+        return metric.parser(df[metric.column])
+    return pd.Series(float("nan"), index=df.index, dtype="float64")
+
+
+def build_comparison(df: pd.DataFrame, kind: str, metrics: list[Metric],
+                     labels: pd.Series | None = None,
+                     keys: pd.Series | None = None) -> pd.DataFrame:
+    """
+    Project the selected rows onto Product (+ Key) + one column per metric.
+
+    Every metric is computed with column operations, so this scales to
+    "Show all" over the full catalogue. Pass precomputed labels / keys
+    (indexed like the sheet) to skip relabelling.
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    if labels is None:
+        labels = make_labels(df, kind)
+    out = {"Product": labels.loc[df.index]}
+    if keys is not None:
+        out["Key"] = keys.loc[df.index]
+    for metric in metrics:
+        out[metric.output] = metric_values(df, metric)
+    return pd.DataFrame(out).reset_index(drop=True)
+
+
+def build_sunscreen_comparison(df: pd.DataFrame,
+                               labels: pd.Series | None = None,
+                               keys: pd.Series | None = None) -> pd.DataFrame:
+    """
+    For selected sunscreen rows, build:
+
+      Product, Key (when keys are given),
+      SPF_lab (UVB),
+      UVA_PF_lab,
+      Blue_light_lab,
+      Visible_lab,
+      Price_per_ml_£
+    """
+    return build_comparison(df, "sun", SUN_METRICS, labels, keys)
+
+
+def build_clothing_comparison(df: pd.DataFrame,
+                              labels: pd.Series | None = None,
+                              keys: pd.Series | None = None) -> pd.DataFrame:
+    """
+    For selected clothing rows, build:
+
+      Product, Key (when keys are given),
+      SPF_lab (UVB),
+      UVA_PF_lab,
+      Blue_light_lab,
+      Visible_lab,
+      Price_£   (total price, not per ml)
+    """
+    return build_comparison(df, "cloth", CLO_METRICS, labels, keys)
@@ -0,0 +1,156 @@
+"""
+Facet counts of a result set: per brand, shop, material and SPF band.
+
+Every facet is factorised once per sheet (FacetIndex), so the counts of
+any set of rows are one np.bincount over their codes rather than a
+value_counts over the filtered frame. FacetCounts remembers the last
+result set of a view; when the filters change it adds the rows that
+entered and subtracts the rows that left, recounting only when most of
+the result set changed.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .parsing import NA_TOKENS, numeric
+
+
+@dataclass(frozen=True)
+class Facet:
+    """
+    A column products are counted by.
+
+    bands: edges binning a number column ("Under 15", "15–30", ..., "50+");
+           empty for a text column, counted by value
+    """
+    column: str
+    title: str
+    bands: tuple = ()
+
+
+SUN_FACETS = [
+    Facet("Product Brand", "Brand"),
+    Facet("Purchased from", "Purchased from"),
+    Facet("SPF (lab)", "SPF band", (15, 30, 50)),
+]
+
+# Clothing keeps UPF in SPF (lab); 15 / 30 / 50 are the UPF rating bands
+CLO_FACETS = [
+    Facet("Product Brand", "Brand"),
+    Facet("Material", "Material"),
+    Facet("Purchased from", "Purchased from"),
+    Facet("SPF (lab)", "UPF band", (15, 30, 50)),
+]
+
+FACETS = {"sun": SUN_FACETS, "cloth": CLO_FACETS}
+
+FACET_COLUMNS = list(dict.fromkeys(f.column for f in SUN_FACETS + CLO_FACETS))
+
+
+def band_names(edges) -> list[str]:
+    """Labels of the bands cut by edges: "Under a", "a–b", ..., "z+"."""
+    names = [f"Under {edges[0]:g}"]
+    names += [f"{lo:g}–{hi:g}" for lo, hi in zip(edges, edges[1:])]
+    return names + [f"{edges[-1]:g}+"]
+
+
+def facet_codes(df: pd.DataFrame,
+                facet: Facet) -> tuple[np.ndarray, list[str]]:
+    """
+    Code of every row (0 where blank, values from 1) and the value names,
+    so names[code - 1] is the row's value.
+    """
+    if facet.bands:
+        values = numeric(df, facet.column).to_numpy(dtype="float64",
+                                                    na_value=np.nan)
+        codes = np.digitize(values, facet.bands) + 1
+        codes[np.isnan(values)] = 0
+        return codes.astype(np.int32), band_names(facet.bands)
+
+    text = df[facet.column].astype(str).str.strip()
+    text = text.mask(text.str.lower().isin(["", "nan", *NA_TOKENS]))
+    codes, names = pd.factorize(text, sort=True)
+    return (codes + 1).astype(np.int32), list(names)
+
+
+class FacetIndex:
+    """
+    Factorised facet values of one sheet, by row position.
+
+    facets: the Facets of the sheet that has their column
+    codes:  title -> int32 code per row (see facet_codes)
+    names:  title -> value of each code
+    totals: title -> count of each value over the whole sheet
+    """
+
+    def __init__(self, df: pd.DataFrame, kind: str):
+        self.size = len(df)
+        self.facets = [f for f in FACETS.get(kind, SUN_FACETS)
+                       if f.column in df.columns]
+        self.codes, self.names = {}, {}
+        for f in self.facets:
+            self.codes[f.title], self.names[f.title] = facet_codes(df, f)
+        self.totals = self.counts(None)
+
+    def counts(self, rows: np.ndarray | None) -> dict[str, np.ndarray]:
+        """Count of each value of each facet over rows (None = every row)."""
+        out = {}
+        for title, codes in self.codes.items():
+            picked = codes if rows is None else codes[rows]
+            found = np.bincount(picked, minlength=len(self.names[title]) + 1)
+            out[title] = found[1:]
+        return out
+
+    def top(self, counts: dict[str, np.ndarray],
+            n: int = 10) -> dict[str, list[tuple[str, int]]]:
+        """
+        The n most frequent values of each facet with their counts; bands
+        keep their own order.
+        """
+        out = {}
+        for f in self.facets:
+            found, names = counts[f.title], self.names[f.title]
+            order = (np.arange(len(found)) if f.bands
+                     else np.argsort(-found, kind="stable")[:n])
+            out[f.title] = [(names[i], int(found[i]))
+                            for i in order if found[i]]
+        return out
+
+
+class FacetCounts:
+    """
+    Facet counts of one view's current result set, kept up to date as its
+    filters change.
+
+    update(rows) counts only the rows that entered or left the result set
+    since the previous call, unless that is more work than recounting.
+    """
+
+    def __init__(self, index: FacetIndex):
+        self.index = index
+        self.rows = None                # None = every row
+        self.counts = index.totals
+
+    def update(self, rows: np.ndarray | None) -> dict[str, np.ndarray]:
+        """Counts for rows (ascending positions; None = every row)."""
+        if rows is None:
+            self.rows, self.counts = None, self.index.totals
+            return self.counts
+        if self.rows is not None and np.array_equal(rows, self.rows):
+            return self.counts
+
+        previous = (np.arange(self.index.size) if self.rows is None
+                    else self.rows)
+        entered = np.setdiff1d(rows, previous, assume_unique=True)
+        left = np.setdiff1d(previous, rows, assume_unique=True)
+        if len(entered) + len(left) < len(rows):
+            added = self.index.counts(entered)
+            removed = self.index.counts(left)
+            self.counts = {title: found + added[title] - removed[title]
+                           for title, found in self.counts.items()}
+        else:
+            self.counts = self.index.counts(rows)
+        self.rows = rows
+        return self.counts
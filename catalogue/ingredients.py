@@ -0,0 +1,125 @@
+"""
+Ingredient (UV filter) index of a sheet: include / exclude filtering.
+
+The free-text "Ingredients List" is split into normalised INCI names at
+ingest: lower-cased, percentages / parentheticals / trailing dots
+dropped, and common trade names mapped to their INCI name (Tinosorb S
+-> bis-ethylhexyloxyphenol methoxyphenyl triazine). Each ingredient gets
+a packed bitmap over the rows (np.packbits), so a filter such as "zinc
+oxide or tinosorb s, and no octocrylene" is a few OR / AND NOT passes
+over n / 8 bytes per ingredient rather than a scan of the text.
+"""
+
+import numpy as np
+import pandas as pd
+
+INGREDIENTS_COL = "Ingredients List"
+
+# Trade / common names -> INCI name (all lower case)
+INCI_ALIASES = {
+    "water": "aqua",
+    "avobenzone": "butyl methoxydibenzoylmethane",
+    "octinoxate": "ethylhexyl methoxycinnamate",
+    "octisalate": "ethylhexyl salicylate",
+    "tinosorb s": "bis-ethylhexyloxyphenol methoxyphenyl triazine",
+    "bemotrizinol": "bis-ethylhexyloxyphenol methoxyphenyl triazine",
+    "tinosorb m": "methylene bis-benzotriazolyl tetramethylbutylphenol",
+    "bisoctrizole": "methylene bis-benzotriazolyl tetramethylbutylphenol",
+    "uvinul a plus": "diethylamino hydroxybenzoyl hexyl benzoate",
+    "uvinul t 150": "ethylhexyl triazone",
+    "mexoryl sx": "terephthalylidene dicamphor sulfonic acid",
+    "ecamsule": "terephthalylidene dicamphor sulfonic acid",
+    "mexoryl xl": "drometrizole trisiloxane",
+    "mexoryl 400": "methoxypropylamino cyclohexenylidene ethoxyethylcyanoacetate",
+    "fragrance": "parfum",
+}
+
+# List fillers that are not ingredients
+NOT_INGREDIENTS = {"", "nan", "etc", "and more", "others"}
+
+
+def parse_ingredients(values: pd.Series) -> pd.Series:
+    """
+    Normalised INCI names per cell, exploded: one entry per ingredient
+    listed, indexed by row position.
+    """
+    parts = (values.astype(str).str.lower()
+             .str.split(r"[,;\n]", regex=True)
+             .set_axis(range(len(values)))
+             .explode()
+             .dropna()
+             .str.replace(r"\([^)]*\)|\d+(?:\.\d+)?\s*%", " ", regex=True)
+             .str.replace(r"\s+", " ", regex=True)
+             .str.strip(" .*"))
+    parts = parts[~parts.isin(NOT_INGREDIENTS)]
+    return parts.replace(INCI_ALIASES)
+
+
+class IngredientIndex:
+    """
+    One packed row bitmap per normalised ingredient.
+
+    names:   ingredients, sorted
+    counts:  rows containing each ingredient
+    bitmaps: uint8 array (len(names), ceil(size / 8)); bit r of row i is
+             set when row r lists names[i]
+    listed:  packed bitmap of rows with an ingredients list at all
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.size = len(df)
+        n_bytes = (self.size + 7) // 8
+        if INGREDIENTS_COL not in df.columns:
+            self.names, self.counts = [], np.zeros(0, dtype=np.int64)
+            self.bitmaps = np.zeros((0, n_bytes), dtype=np.uint8)
+            self.listed = np.zeros(n_bytes, dtype=np.uint8)
+            self._ids = {}
+            return
+
+        found = parse_ingredients(df[INGREDIENTS_COL])
+        codes, names = pd.factorize(found, sort=True)
+        rows = found.index.to_numpy()
+        # Set bit (row) of bitmap (code) in place, MSB first like packbits
+        masks = (0x80 >> (rows & 7)).astype(np.uint8)
+        self.bitmaps = np.zeros((len(names), n_bytes), dtype=np.uint8)
+        np.bitwise_or.at(self.bitmaps, (codes, rows >> 3), masks)
+        self.listed = np.zeros(n_bytes, dtype=np.uint8)
+        np.bitwise_or.at(self.listed, rows >> 3, masks)
+        self.names = list(names)
+        self.counts = np.unpackbits(self.bitmaps, axis=1,
+                                    count=self.size).sum(axis=1, dtype=np.int64)
+        self._ids = {name: i for i, name in enumerate(self.names)}
+
+    def _id(self, name: str):
+        """Bitmap row of an ingredient, by INCI or trade name; None if absent."""
+        name = name.strip().lower()
+        return self._ids.get(INCI_ALIASES.get(name, name))
+
+    def count(self, name: str) -> int:
+        """Rows listing name."""
+        i = self._id(name)
+        return 0 if i is None else int(self.counts[i])
+
+    def _union(self, names) -> np.ndarray:
+        ids = [i for i in map(self._id, names) if i is not None]
+        if not ids:
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[ids], axis=0)
+
+    def match(self, any_of=(), all_of=(), none_of=()) -> np.ndarray:
+        """
+        Row positions (ascending) listing at least one of any_of, every
+        one of all_of and none of none_of.
+
+        Rows without an ingredients list never pass an exclusion: an
+        unknown formula can't be shown to be free of an allergen.
+        """
+        bits = np.full(self.bitmaps.shape[1], 0xFF, dtype=np.uint8)
+        if any_of:
+            bits &= self._union(any_of)
+        for name in all_of:
+            i = self._id(name)
+            bits &= self.bitmaps[i] if i is not None else np.zeros_like(bits)
+        if none_of:
+            bits &= self.listed & ~self._union(none_of)
+        return np.flatnonzero(np.unpackbits(bits, count=self.size))
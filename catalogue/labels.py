@@ -0,0 +1,99 @@
+"""Dropdown labels and stable row keys for catalogue sheets."""
+
+import pandas as pd
+
+from .parsing import NA_TOKENS, is_typed_col
+
+
+def make_labels(df: pd.DataFrame, kind: str) -> pd.Series:
+    """
+    Human-readable labels for dropdowns, one per row of df.
+
+    Sunscreens: Brand — Name — 50 ml
+    Clothing:   Brand — Name — Material
+
+    Rows without brand and name fall back to their first non-empty cell.
+    """
+    def text(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series("", index=df.index, dtype=object)
+        return df[col].astype(str).str.strip()
+
+    brand = text("Product Brand")
+    name = text("Product Name")
+    sep = pd.Series(" — ", index=df.index).where((brand != "") & (name != ""), "")
+    label = brand + sep + name
+
+    extra = pd.Series("", index=df.index, dtype=object)
+    if kind == "sun":
+        vol = text("Volume (ml)")
+        extra = (" — " + vol + " ml").where((vol != "") & (vol.str.lower() != "nan"), "")
+    elif kind == "cloth":
+        mat = text("Material")
+        extra = (" — " + mat).where((mat != "") & (mat.str.lower() != "nan"), "")
+
+    missing = label == ""
+    if missing.any():
+        # Fallback: first non-empty cell from the row (raw cells only)
+        raw = df.loc[missing, [c for c in df.columns if not is_typed_col(c)]]
+        raw = raw.astype(str)
+        first = raw.where(raw.apply(lambda c: c.str.strip() != "")).bfill(axis=1)
+        label = label.copy()
+        label[missing] = first.iloc[:, 0].fillna("") if first.shape[1] else ""
+
+    return (label + extra).str.strip(" —")
+
+
+def make_label(row: pd.Series, kind: str) -> str:
+    """Label for a single row; see make_labels."""
+    return make_labels(row.to_frame().T, kind).iloc[0]
+
+
+# Identifying columns hashed into a key when a row has no batch/serial ID
+ID_COL = "ID if any (Batch, Serial etc)"
+KEY_COLS = [
+    "Product Brand",
+    "Product Name",
+    "Volume (ml)",
+    "Material",
+    "Price (£)",
+    "Purchased from",
+    "Date of Entry",
+]
+
+
+def make_keys(df: pd.DataFrame) -> pd.Series:
+    """
+    Stable, unique key per row.
+
+    The batch/serial ID when present, otherwise a hash of KEY_COLS
+    ('h:' + 16 hex digits); IDs like 'N/A' or 'none' count as absent. Repeats get '#2', '#3', ... in sheet order.
+    """
+    return number_repeats(make_base_keys(df))
+
+
+def make_base_keys(df: pd.DataFrame) -> pd.Series:
+    """Key of each row from its own cells, before repeats are numbered."""
+    present = [c for c in KEY_COLS if c in df.columns]
+    if not present:
+        present = [c for c in df.columns if not is_typed_col(c)]
+    hashed = pd.util.hash_pandas_object(df[present].astype(str), index=False)
+    keys = "h:" + hashed.map("{:016x}".format).astype(str)
+
+    if ID_COL in df.columns:
+        ids = df[ID_COL].astype(str).str.strip()
+        absent = (ids == "") | ids.str.lower().isin([*NA_TOKENS, "nan"])
+        keys = ids.where(~absent, keys)
+    return keys
+
+
+def number_repeats(keys: pd.Series) -> pd.Series:
+    """keys with the 2nd, 3rd, ... occurrence of a key suffixed '#2', '#3'."""
+    dup = keys.groupby(keys, sort=False).cumcount()
+    return keys.where(dup == 0, keys + "#" + (dup + 1).astype(str))
+
+
+def unique_labels(labels: pd.Series, keys: pd.Series) -> pd.Series:
+    """Append the key to labels shared by several rows, so none are ambiguous."""
+    shared = labels.duplicated(keep=False)
+    return labels.where(~shared, labels + " [" + keys + "]")
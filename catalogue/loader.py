@@ -0,0 +1,245 @@
+"""
+Reading catalogue sheets from the Excel workbook.
+
+Parsed sheets are kept as uncompressed Arrow sidecar files in CACHE_DIR,
+keyed on the workbook's path, mtime, size and content hash, so openpyxl
+only runs when the workbook actually changed.
+"""
+
+import hashlib
+import importlib.util
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DATA_XLSX = BASE_DIR / "photoprotection_catalogue_template.xlsx"
+SHEET_SUN = "Sunscreens"
+SHEET_CLO = "Clothing"
+
+# Columnar sidecar copies of the workbook sheets live here (see read_sheets)
+CACHE_DIR = BASE_DIR / ".cache"
+
+
+def workbook_key(path: Path) -> dict:
+    """Identity of a workbook on disk: path, mtime, size and content hash."""
+    stat = path.stat()
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return {
+        "path": str(path.resolve()),
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _sidecar_files(path: Path, spec: dict) -> tuple[str, Path]:
+    """
+    Stem and key file of the sidecar for one read of a workbook.
+
+    spec (sheets, columns, engine) is part of the name, so different reads
+    of the same workbook don't overwrite each other's cache.
+    """
+    ident = json.dumps([str(path.resolve()), spec], sort_keys=True)
+    tag = hashlib.sha1(ident.encode("utf-8")).hexdigest()[:12]
+    stem = f"{path.stem}-{tag}"
+    return stem, CACHE_DIR / f"{stem}.key.json"
+
+
+def read_sidecar(path: Path, key: dict, spec: dict):
+    """Cached sheets (name -> DataFrame) if the key matches, else None."""
+    stem, key_file = _sidecar_files(path, spec)
+    try:
+        stored = json.loads(key_file.read_text(encoding="utf-8"))
+        if stored.get("workbook") != key or stored.get("spec") != spec:
+            return None
+        return {
+            sheet: feather.read_table(CACHE_DIR / f"{stem}.{i}.arrow",
+                                      memory_map=True).to_pandas()
+            for i, sheet in enumerate(stored["sheets"])
+        }
+    except (OSError, ValueError, KeyError, pa.ArrowException):
+        return None
+
+
+def write_sidecar(path: Path, key: dict, spec: dict,
+                  frames: dict[str, pd.DataFrame]) -> None:
+    """
+    Store parsed sheets as uncompressed Arrow files (mmap-friendly).
+
+    The key file is written last, so a half-written cache never matches.
+    Failures are ignored: the cache is an optimisation, not a requirement.
+    """
+    stem, key_file = _sidecar_files(path, spec)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        key_file.unlink(missing_ok=True)
+        for i, df in enumerate(frames.values()):
+            data_file = CACHE_DIR / f"{stem}.{i}.arrow"
+            tmp = data_file.with_suffix(".arrow.tmp")
+            feather.write_feather(df, tmp, compression="uncompressed")
+            os.replace(tmp, data_file)
+        stored = {"workbook": key, "spec": spec, "sheets": list(frames)}
+        key_file.write_text(json.dumps(stored), encoding="utf-8")
+    except (OSError, pa.ArrowException):
+        pass
+
+
+def clear_sidecars(path: Path) -> None:
+    """Drop every cached read of the workbook at path."""
+    for f in CACHE_DIR.glob(f"{path.stem}-{'?' * 12}.*"):
+        f.unlink(missing_ok=True)
+
+
+# Excel engines: the full openpyxl object model through pandas, openpyxl
+# read-only streaming, or calamine (Rust) when python-calamine is installed
+ENGINE_PANDAS = "openpyxl"
+ENGINE_STREAM = "openpyxl-stream"
+ENGINE_CALAMINE = "calamine"
+
+# Text pandas reads as missing by default; the streaming reader matches it
+NA_STRINGS = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+
+def default_engine() -> str:
+    if importlib.util.find_spec("python_calamine") is None:
+        return ENGINE_STREAM
+    return ENGINE_CALAMINE
+
+
+def _cell_text(value) -> str:
+    """A cell as pd.read_excel(dtype=str).fillna("") would render it."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    text = str(value)
+    return "" if text in NA_STRINGS else text
+
+
+def _header_names(header) -> list[str]:
+    """Header cells as pandas names them: 'Unnamed: i' for blanks, x.1 for repeats."""
+    names, seen = [], {}
+    for i, value in enumerate(header):
+        name = f"Unnamed: {i}" if value is None else str(value)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def _stream_worksheet(ws, columns: list[str] | None) -> pd.DataFrame:
+    """
+    One read-only worksheet as text, streamed row by row.
+
+    Rows go from iter_rows(values_only=True) into one list per kept column,
+    so no cell objects are built. Trailing empty rows are dropped, like
+    pd.read_excel does.
+    """
+    ws.reset_dimensions()  # don't trust the stored sheet size
+    rows = ws.iter_rows(values_only=True)
+    names = _header_names(next(rows, ()))
+    keep = [i for i, name in enumerate(names)
+            if columns is None or name in columns]
+    buffers = [[] for _ in keep]
+    n_rows = n_kept = 0
+    for row in rows:
+        for buf, i in zip(buffers, keep):
+            buf.append(_cell_text(row[i]) if i < len(row) else "")
+        n_rows += 1
+        if any(v is not None for v in row):
+            n_kept = n_rows
+
+    for buf in buffers:
+        del buf[n_kept:]  # trailing empty rows
+
+    return pd.DataFrame(
+        {names[i]: pd.Series(buf, dtype=object) for i, buf in zip(keep, buffers)},
+        index=pd.RangeIndex(n_kept),
+    ).astype(str)
+
+
+def read_sheets_streaming(path: Path, sheets: list[str],
+                          columns: list[str] | None = None) -> dict:
+    """
+    Read several sheets with openpyxl in read-only mode, opening the
+    workbook (zip, shared strings, styles) once. Missing sheets are skipped.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return {sheet: _stream_worksheet(wb[sheet], columns)
+                for sheet in sheets if sheet in wb.sheetnames}
+    finally:
+        wb.close()
+
+
+def _read_with_pandas(path: Path, sheets: list[str], engine: str,
+                      columns: list[str] | None) -> dict:
+    """Several sheets through pd.ExcelFile (one open); missing ones skipped."""
+    usecols = None if columns is None else (lambda c: str(c) in columns)
+    frames = {}
+    with pd.ExcelFile(path, engine=engine) as xl:
+        for sheet in sheets:
+            if sheet not in xl.sheet_names:
+                continue
+            df = xl.parse(sheet_name=sheet, dtype=str, usecols=usecols)
+            df = df.fillna("")
+            df.columns = [str(c) for c in df.columns]
+            frames[sheet] = df
+    return frames
+
+
+def read_sheets(path: Path, sheets: list[str], key: dict | None = None,
+                columns: list[str] | None = None,
+                engine: str | None = None) -> dict[str, pd.DataFrame]:
+    """
+    Load several sheets as text in one pass over the workbook.
+
+    Headers & order are kept exactly as in Excel; only columns (all when
+    None) are read; sheets missing from the workbook are left out of the
+    result. The Excel engine only runs when the workbook changed since
+    the last parse; otherwise the sheets come from the Arrow sidecar in
+    CACHE_DIR, stored under a single key for the whole read.
+
+    Opening the workbook once only saves the zip / shared-strings setup
+    (~10 ms); parsing each worksheet's cells is most of the cost, so one
+    pass is about as fast as a pass per sheet.
+    """
+    if key is None:
+        key = workbook_key(path)
+    engine = engine or default_engine()
+    spec = {"sheets": list(sheets), "columns": columns, "engine": engine}
+    frames = read_sidecar(path, key, spec)
+    if frames is None:
+        if engine == ENGINE_STREAM:
+            frames = read_sheets_streaming(path, sheets, columns)
+        else:
+            frames = _read_with_pandas(path, sheets, engine, columns)
+        write_sidecar(path, key, spec, frames)
+    return frames
+
+
+def read_sheet(path: Path, sheet: str, key: dict | None = None,
+               columns: list[str] | None = None,
+               engine: str | None = None) -> pd.DataFrame:
+    """Load a single sheet as text; see read_sheets."""
+    frames = read_sheets(path, [sheet], key, columns, engine)
+    if sheet not in frames:
+        raise KeyError(f"Worksheet {sheet} does not exist.")
+    return frames[sheet]
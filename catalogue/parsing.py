@@ -0,0 +1,100 @@
+"""Numeric and date parsing of spreadsheet text cells."""
+
+import numpy as np
+import pandas as pd
+
+NA_TOKENS = ["na", "n/a", "none"]
+NUM_SUFFIX = " __num"
+DATE_SUFFIX = " __date"
+
+
+def num_col(col: str) -> str:
+    """
+    Name of the float64 shadow column holding the parsed values of col
+    (added at load time by schema.add_typed_columns).
+    """
+    return col + NUM_SUFFIX
+
+
+def is_num_col(col) -> bool:
+    return str(col).endswith(NUM_SUFFIX)
+
+
+def date_col(col: str) -> str:
+    """Name of the datetime64 shadow column holding the parsed dates of col."""
+    return col + DATE_SUFFIX
+
+
+def is_typed_col(col) -> bool:
+    """True for parsed shadow columns (numbers or dates), False for raw cells."""
+    return str(col).endswith((NUM_SUFFIX, DATE_SUFFIX))
+
+
+def number_text(text: str) -> str:
+    """
+    The number in a cell's text, ready for float() / pd.to_numeric:
+
+    - '' / 'N/A' / 'na' / 'none' -> ''
+    - '50+' -> '50'
+    - '12%' -> '12'
+    """
+    s = text.strip()
+    if s.lower() in NA_TOKENS:
+        return ""
+    return s.removesuffix("+").removesuffix("%")
+
+
+def to_float_series(values: pd.Series) -> pd.Series:
+    """
+    Column-level version of to_float, returning float64 (NaN for missing).
+
+    Cells repeat a lot ('50', '30+', 'N/A'), so number_text runs once per
+    distinct text and the parsed values are spread back by factorize codes.
+    """
+    codes, uniques = pd.factorize(values.astype(str))
+    texts = pd.Series([number_text(u) for u in uniques], dtype=object)
+    parsed = pd.to_numeric(texts, errors="coerce").to_numpy(dtype="float64")
+    out = np.full(len(codes), np.nan)
+    found = codes >= 0
+    out[found] = parsed[codes[found]]
+    return pd.Series(out, index=values.index, name=values.name)
+
+
+def to_date_series(values: pd.Series) -> pd.Series:
+    """
+    Dates in a text column as datetime64 (NaT for missing / unparseable).
+
+    ISO dates (what Excel cells come back as) are parsed in one vectorised
+    pass; anything else falls back to day-first free-form parsing.
+    """
+    s = values.astype(str).str.strip()
+    s = s.mask(s.str.lower().isin(NA_TOKENS), "")
+    parsed = pd.to_datetime(s, format="ISO8601", errors="coerce")
+    rest = parsed.isna() & (s != "")
+    if rest.any():
+        parsed[rest] = pd.to_datetime(s[rest], format="mixed", dayfirst=True,
+                                      errors="coerce")
+    return parsed
+
+
+def to_float(value):
+    """
+    Safely convert a single spreadsheet value to float (None if missing).
+
+    Same rules as to_float_series (see number_text), without pandas.
+    """
+    if value is None:
+        return None
+    try:
+        return float(number_text(str(value)))
+    except ValueError:
+        return None
+
+
+def numeric(df: pd.DataFrame, col: str) -> pd.Series:
+    """Parsed values of col: the shadow column if present, else parse now."""
+    if num_col(col) in df.columns:
+        return df[num_col(col)]
+    if col in df.columns:
+        return to_float_series(df[col])
+    return pd.Series(float("nan"), index=df.index, dtype="float64")
@@ -0,0 +1,116 @@
+"""
+Numeric range filters over a whole sheet, backed by sorted arrays.
+
+SortedIndex keeps, per metric, the row positions sorted by value; a
+bound is two searchsorted calls and the matching rows are one slice, so
+a filter costs O(log n + k) for k matches. Several filters start from
+the most selective one and check the others on its k rows only, never
+building a full-length mask.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .compare import CLO_METRICS, SUN_METRICS, metric_values
+from .parsing import numeric
+
+VOLUME = "Volume_ml"
+
+MIN = "min"
+MAX = "max"
+RANGE = "range"
+
+
+@dataclass(frozen=True)
+class RangeFilter:
+    """A filter widget: metric, title, which bound(s) it sets and its step."""
+    metric: str
+    title: str
+    bound: str = MIN
+    step: float = 1.0
+
+
+SUN_FILTERS = [
+    RangeFilter("SPF_lab (UVB)", "Min SPF (lab)"),
+    RangeFilter("UVA_PF_lab", "Min UVA PF (lab)"),
+    RangeFilter("Visible_lab", "Min visible protection (lab)", step=0.01),
+    RangeFilter("Price_per_ml_£", "Max price per ml (£)", MAX, step=0.01),
+    RangeFilter(VOLUME, "Volume (ml)", RANGE),
+]
+
+CLO_FILTERS = SUN_FILTERS[:3] + [RangeFilter("Price_£", "Max price (£)", MAX)]
+
+FILTERS = {"sun": SUN_FILTERS, "cloth": CLO_FILTERS}
+
+
+def sheet_metrics(df: pd.DataFrame, kind: str) -> dict[str, np.ndarray]:
+    """Every comparison metric of the sheet, plus volume, as float64 arrays."""
+    metrics = CLO_METRICS if kind == "cloth" else SUN_METRICS
+    values = {m.output: metric_values(df, m) for m in metrics}
+    values[VOLUME] = numeric(df, "Volume (ml)")
+    return {name: v.to_numpy(dtype="float64", na_value=np.nan)
+            for name, v in values.items()}
+
+
+class SortedIndex:
+    """
+    Per-metric sorted values of one sheet, by row position.
+
+    values:  metric -> float64 values (NaN where missing)
+    order:   metric -> positions sorted by value, missing values excluded
+    ordered: metric -> values[order], ascending (for searchsorted)
+    """
+
+    def __init__(self, values: dict[str, np.ndarray], size: int):
+        self.size = size
+        self.values, self.order, self.ordered = values, {}, {}
+        for metric, v in values.items():
+            order = np.argsort(v, kind="stable")[:np.count_nonzero(~np.isnan(v))]
+            self.order[metric] = order
+            self.ordered[metric] = v[order]
+
+    @classmethod
+    def for_sheet(cls, df: pd.DataFrame, kind: str) -> "SortedIndex":
+        return cls(sheet_metrics(df, kind), len(df))
+
+    def span(self, metric: str, low=None, high=None) -> tuple[int, int]:
+        """Slice of order[metric] within [low, high] (None = unbounded)."""
+        ordered = self.ordered[metric]
+        start = 0 if low is None else int(np.searchsorted(ordered, low, "left"))
+        stop = (len(ordered) if high is None
+                else int(np.searchsorted(ordered, high, "right")))
+        return start, max(start, stop)
+
+    def within(self, metric: str, low=None, high=None) -> np.ndarray:
+        """Positions whose metric lies in [low, high], in value order."""
+        start, stop = self.span(metric, low, high)
+        return self.order[metric][start:stop]
+
+    def select(self, bounds: dict) -> np.ndarray | None:
+        """
+        Row positions (ascending) within every (low, high) of bounds.
+
+        None when no bound is set (every row passes).
+        """
+        bounds = {m: b for m, b in bounds.items() if b != (None, None)}
+        if not bounds:
+            return None
+        # Smallest candidate set first; the others are checked on it only
+        spans = {m: self.span(m, *b) for m, b in bounds.items()}
+        first = min(spans, key=lambda m: spans[m][1] - spans[m][0])
+        start, stop = spans[first]
+        rows = self.order[first][start:stop]
+        for metric, (low, high) in bounds.items():
+            if metric == first or not len(rows):
+                continue
+            v = self.values[metric][rows]
+            keep = ~np.isnan(v)
+            if low is not None:
+                keep &= v >= low
+            if high is not None:
+                keep &= v <= high
+            rows = rows[keep]
+        return np.sort(rows)
+
@@ -0,0 +1,110 @@
+"""
+Catalogue-wide ranking: "best value" top-N over a whole sheet.
+
+Each criterion is a comparison metric (see compare.py) scored by its
+percentile within the sheet, flipped for metrics where lower is better
+(price). A query is a weighted mean of those scores over the products
+that pass the thresholds. Everything that depends only on the sheet
+(values, sort orders, percentile scores) is computed once per sheet in
+RankIndex and the sheet's SortedIndex, so a query is a few vectorised
+passes over float arrays.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .ranges import SortedIndex
+
+
+@dataclass(frozen=True)
+class Criterion:
+    """A comparison metric products can be ranked and filtered on."""
+    metric: str
+    title: str
+    lower_is_better: bool = False
+
+
+SUN_CRITERIA = [
+    Criterion("SPF_lab (UVB)", "SPF (lab)"),
+    Criterion("UVA_PF_lab", "UVA PF (lab)"),
+    Criterion("Blue_light_lab", "Blue light (lab)"),
+    Criterion("Visible_lab", "Visible light (lab)"),
+    Criterion("Price_per_ml_£", "Price per ml (£)", lower_is_better=True),
+]
+
+CLO_CRITERIA = SUN_CRITERIA[:4] + [
+    Criterion("Price_£", "Price (£)", lower_is_better=True),
+]
+
+CRITERIA = {"sun": SUN_CRITERIA, "cloth": CLO_CRITERIA}
+
+
+class RankIndex:
+    """
+    Precomputed percentile scores for ranking one sheet, by row position.
+
+    ranges:  the sheet's SortedIndex (values and sort orders per metric)
+    scores:  metric -> 0..1 percentile score, 1 = best, 0 where missing
+    """
+
+    def __init__(self, df: pd.DataFrame, kind: str,
+                 ranges: SortedIndex | None = None):
+        self.criteria = CRITERIA.get(kind, SUN_CRITERIA)
+        self.ranges = ranges or SortedIndex.for_sheet(df, kind)
+        self.values = self.ranges.values
+        self.size = len(df)
+        self.scores = {}
+        for c in self.criteria:
+            pct = pd.Series(self.values[c.metric]).rank(
+                pct=True, method="average", ascending=not c.lower_is_better)
+            self.scores[c.metric] = pct.fillna(0.0).to_numpy()
+
+    def score(self, weights: dict) -> np.ndarray:
+        """Weighted mean of the percentile scores, 0..1 per row."""
+        total = sum(w for w in weights.values() if w > 0)
+        score = np.zeros(self.size)
+        if total == 0:
+            return score
+        for metric, w in weights.items():
+            if w > 0:
+                score += w * self.scores[metric]
+        return score / total
+
+    def top(self, weights: dict, thresholds: dict | None = None,
+            n: int = 10) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Positions and scores of the n best rows, best first.
+
+        Only rows passing thresholds (metric -> (low, high)) are ranked;
+        ties keep sheet order.
+        """
+        candidates = self.ranges.select(thresholds or {})
+        if candidates is None:
+            candidates = np.arange(self.size)
+        score = self.score(weights)[candidates]
+        if n < len(candidates):
+            # n-th best score; ties at the cut go to the earliest rows
+            cut = np.partition(score, len(score) - n)[len(score) - n]
+            above = np.flatnonzero(score > cut)
+            tied = np.flatnonzero(score == cut)[:n - len(above)]
+            pick = np.concatenate([above, tied])
+            candidates, score = candidates[pick], score[pick]
+        best = np.lexsort((candidates, -score))
+        return candidates[best], score[best]
+
+
+def ranking_table(sheet, positions: np.ndarray,
+                  scores: np.ndarray) -> pd.DataFrame:
+    """Rank, Product, Key, Score (0-100) and every criterion for the rows."""
+    index = sheet.ranking
+    out = {
+        "Rank": np.arange(1, len(positions) + 1),
+        "Product": sheet.labels.iloc[positions].to_numpy(),
+        "Key": sheet.keys.iloc[positions].to_numpy(),
+        "Score": np.round(scores * 100, 1),
+    }
+    for c in index.criteria:
+        out[c.title] = index.values[c.metric][positions]
+    return pd.DataFrame(out)
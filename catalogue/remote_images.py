@@ -0,0 +1,159 @@
+"""
+Server-side fetching of product images given as http(s) URLs.
+
+Images are downloaded once into an on-disk cache and revalidated with
+ETag / Last-Modified after FETCH_MAX_AGE seconds. A selection's images
+are resolved in parallel on a bounded thread pool; anything that fails
+(timeout, HTTP error, not an image) resolves to a placeholder.
+
+Everything goes through ImageFetcher, so it can be pointed at a local
+HTTP stand-in and a temporary cache_dir.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+try:
+    from PIL import Image
+except ImportError:  # no validation / placeholder without Pillow
+    Image = None
+
+from .loader import CACHE_DIR
+
+REMOTE_DIR = CACHE_DIR / "remote"
+FETCH_TIMEOUT = 5.0
+FETCH_WORKERS = 8
+FETCH_MAX_AGE = 3600
+FETCH_MAX_BYTES = 10 * 1024 * 1024
+USER_AGENT = "photoprotection-catalogue/1.0"
+
+
+def is_url(ref: str) -> bool:
+    return ref.lower().startswith(("http://", "https://"))
+
+
+class ImageFetcher:
+    """Bounded, cached, revalidating image downloader (thread-safe)."""
+
+    def __init__(self, cache_dir: Path = REMOTE_DIR,
+                 timeout: float = FETCH_TIMEOUT,
+                 max_workers: int = FETCH_WORKERS,
+                 max_age: float = FETCH_MAX_AGE):
+        self.cache_dir = Path(cache_dir)
+        self.timeout = timeout
+        self.max_age = max_age
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix="image-fetch")
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / name, self.cache_dir / f"{name}.json"
+
+    def _lock(self, url: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(url, threading.Lock())
+
+    def fetch(self, url: str) -> Path | None:
+        """
+        Local path of the image at url, or None if it can't be obtained.
+
+        Fresh cache entries are returned without a request; stale ones are
+        revalidated, and kept if that fails (server unreachable, error
+        status, or a body that isn't a usable image).
+        """
+        body, meta_file = self._paths(url)
+        with self._lock(url):
+            meta = {}
+            if body.exists():
+                try:
+                    meta = json.loads(meta_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    meta = {}
+                if time.time() - meta.get("checked", 0) < self.max_age:
+                    return body
+
+            headers = {"User-Agent": USER_AGENT}
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+            try:
+                with urlopen(Request(url, headers=headers),
+                             timeout=self.timeout) as resp:
+                    data = resp.read(FETCH_MAX_BYTES + 1)
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+            except HTTPError as e:
+                if e.code == 304 and meta:
+                    self._write_meta(meta_file, {**meta, "checked": time.time()})
+                    return body
+                return body if meta else None
+            except (URLError, OSError, ValueError):
+                return body if meta else None
+
+            if len(data) > FETCH_MAX_BYTES or not _is_image(data):
+                return body if meta else None
+
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                tmp = body.with_name(body.name + ".tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, body)
+            except OSError:
+                return body if meta else None
+            self._write_meta(meta_file, {
+                "url": url,
+                "etag": etag,
+                "last_modified": last_modified,
+                "checked": time.time(),
+            })
+            return body
+
+    def fetch_all(self, urls) -> dict[str, Path | None]:
+        """Resolve every url in parallel; returns url -> path (or None)."""
+        unique = list(dict.fromkeys(urls))
+        return dict(zip(unique, self._pool.map(self.fetch, unique)))
+
+    @staticmethod
+    def _write_meta(meta_file: Path, meta: dict) -> None:
+        try:
+            meta_file.write_text(json.dumps(meta), encoding="utf-8")
+        except OSError:
+            pass
+
+
+def _is_image(data: bytes) -> bool:
+    """True if Pillow can identify data as an image (or Pillow is missing)."""
+    if Image is None:
+        return bool(data)
+    try:
+        with Image.open(io.BytesIO(data)) as im:
+            im.verify()
+    except Exception:
+        return False
+    return True
+
+
+def placeholder(cache_dir: Path = REMOTE_DIR, size: int = 240) -> Path | None:
+    """A plain grey square shown in place of images that failed to load."""
+    if Image is None:
+        return None
+    out = cache_dir / f"placeholder-{size}.png"
+    if not out.exists():
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            Image.new("RGB", (size, size), (224, 224, 224)).save(out)
+        except OSError:
+            return None
+    return out
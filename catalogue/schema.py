@@ -0,0 +1,154 @@
+"""
+Declared schema of the catalogue sheets, and ingest-time validation.
+
+Each sheet kind has a list of Fields. At load time add_typed_columns
+parses every number / date field once into a shadow column (see
+parsing.num_col / date_col), and validate checks the sheet against the
+schema, producing one row per problem found:
+
+    Row      spreadsheet row (header is row 1); empty for sheet-level issues
+    Key      stable key of the row (see make_keys)
+    Column   the offending column
+    Value    the raw cell text
+    Problem  what is wrong with it
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .parsing import (
+    NA_TOKENS,
+    date_col,
+    num_col,
+    to_date_series,
+    to_float_series,
+)
+
+TEXT = "text"
+NUMBER = "number"
+DATE = "date"
+
+ISSUE_COLUMNS = ["Row", "Key", "Column", "Value", "Problem"]
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One column of a sheet.
+
+    required: the column must exist and no cell may be empty
+    min, max: allowed range (inclusive) of a number field
+    """
+    column: str
+    type: str = TEXT
+    required: bool = False
+    min: float | None = None
+    max: float | None = None
+
+
+# Blue light / visible protection are fractions (0.12 = 12%) in the
+# workbook, and CSV exports are scaled to fractions on import (see
+# sources.CsvColumn), so a percentage typed into them shows up above 1
+COMMON_FIELDS = [
+    Field("Product Name", required=True),
+    Field("Product Brand"),
+    Field("Date of Entry", DATE),
+    Field("Price (£)", NUMBER, min=0),
+    Field("Volume (ml)", NUMBER, min=0),
+    Field("UVA Protection (Lab)", NUMBER, min=1, max=100),
+    Field("Blue Light Protection (lab)", NUMBER, min=0, max=1),
+    Field("Visible Protection (lab)", NUMBER, min=0, max=1),
+]
+
+SUN_SCHEMA = COMMON_FIELDS + [Field("SPF (lab)", NUMBER, min=1, max=200)]
+
+# Clothing keeps UPF in SPF (lab); dense fabrics measure well above 200
+CLO_SCHEMA = COMMON_FIELDS + [Field("SPF (lab)", NUMBER, min=1, max=2000)]
+
+SCHEMAS = {"sun": SUN_SCHEMA, "cloth": CLO_SCHEMA}
+
+
+def schema_for(kind: str) -> list[Field]:
+    return SCHEMAS.get(kind, COMMON_FIELDS)
+
+
+def add_typed_columns(df: pd.DataFrame, schema: list[Field]) -> pd.DataFrame:
+    """Append the parsed shadow column of every number / date field in df."""
+    typed = {}
+    for f in schema:
+        if f.column not in df.columns:
+            continue
+        if f.type == NUMBER:
+            typed[num_col(f.column)] = to_float_series(df[f.column])
+        elif f.type == DATE:
+            typed[date_col(f.column)] = to_date_series(df[f.column])
+    if not typed:
+        return df
+    return df.assign(**typed)
+
+
+def _blank(text: pd.Series) -> pd.Series:
+    return (text == "") | text.str.lower().isin([*NA_TOKENS, "nan"])
+
+
+def validate(df: pd.DataFrame, schema: list[Field],
+             keys: pd.Series | None = None,
+             rows: np.ndarray | None = None) -> pd.DataFrame:
+    """
+    Issue report (ISSUE_COLUMNS) for a sheet with its typed columns.
+
+    Only the shadow columns built by add_typed_columns are consulted, so
+    nothing is parsed again here. When df holds only some rows of a sheet,
+    rows gives their positions in it (for the Row column).
+    """
+    if keys is None:
+        keys = pd.Series("", index=df.index)
+    if rows is None:
+        rows = np.arange(len(df))
+    found = []
+
+    def report(mask: pd.Series, column: str, problem: str) -> None:
+        positions = np.flatnonzero(mask.to_numpy())
+        if not len(positions):
+            return
+        found.append(pd.DataFrame({
+            "Row": rows[positions] + 2,
+            "Key": keys.iloc[positions].to_numpy(),
+            "Column": column,
+            "Value": df[column].iloc[positions].to_numpy(),
+            "Problem": problem,
+        }))
+
+    for f in schema:
+        if f.column not in df.columns:
+            if f.required:
+                found.append(pd.DataFrame([{
+                    "Row": None, "Key": "", "Column": f.column, "Value": "",
+                    "Problem": "required column is missing",
+                }]))
+            continue
+
+        text = df[f.column].astype(str).str.strip()
+        blank = _blank(text)
+        if f.required:
+            report(blank, f.column, "value is required")
+
+        if f.type == NUMBER and num_col(f.column) in df.columns:
+            values = df[num_col(f.column)]
+            report(~blank & values.isna(), f.column, "not a number")
+            if f.min is not None:
+                report(values < f.min, f.column, f"below minimum {f.min:g}")
+            if f.max is not None:
+                report(values > f.max, f.column, f"above maximum {f.max:g}")
+        elif f.type == DATE and date_col(f.column) in df.columns:
+            report(~blank & df[date_col(f.column)].isna(), f.column,
+                   "not a date")
+
+    if not found:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    issues = pd.concat(found, ignore_index=True)
+    return issues.sort_values("Row", kind="stable", na_position="first",
+                              ignore_index=True)
+
@@ -0,0 +1,337 @@
+"""
+Full-text search over the text columns of a sheet.
+
+SearchIndex is an inverted index: every lower-cased word of the
+SEARCH_COLUMNS maps to the row positions containing it. Terms are kept
+sorted, so all terms starting with a prefix form one contiguous block,
+and postings are stored term by term in one flat array (CSR layout), so
+a prefix's rows are a single slice. A query matches the rows containing
+every one of its words, each taken as a prefix ("octo meth" finds
+"Octocrylene ... Methoxydibenzoylmethane").
+
+Words that match nothing are looked up fuzzily among brand and product
+name words ("nivia" -> "nivea", "posey" -> "posay"): a trigram index of
+that vocabulary yields the candidate terms sharing enough trigrams with
+the word, and only those are checked for a bounded edit distance.
+
+Indexes are saved in CACHE_DIR/search under the sheet's source and
+content version, so a restart loads them instead of rebuilding.
+"""
+
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from .loader import CACHE_DIR
+
+SEARCH_DIR = CACHE_DIR / "search"
+SEARCH_FORMAT = 2  # bump when the on-disk layout or tokenizer changes
+
+SEARCH_COLUMNS = [
+    "Product Brand",
+    "Product Name",
+    "Material",
+    "Coatings",
+    "Ingredients List",
+    "Any Additional Claims",
+]
+
+# Columns whose words are candidates for typo-tolerant lookup
+NAME_COLUMNS = ["Product Brand", "Product Name"]
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_RE.findall(text.lower())
+
+
+def max_edits(word: str) -> int:
+    """Typos tolerated in a word: none when very short, then 1, then 2."""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) <= 5 else 2
+
+
+def trigrams(word: str) -> list[str]:
+    """Distinct trigrams of word padded as '$$word$'."""
+    padded = f"$${word}$"
+    return list(dict.fromkeys(padded[i:i + 3] for i in range(len(padded) - 2)))
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance of a and b, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return min(prev[-1], limit + 1)
+
+
+class TrigramIndex:
+    """
+    Trigram -> ids of the terms containing it, over a term vocabulary.
+
+    Same CSR layout as SearchIndex: term_ids[offsets[i]:offsets[i + 1]]
+    are the terms containing grams[i].
+    """
+
+    def __init__(self, grams: list[str], offsets: np.ndarray,
+                 term_ids: np.ndarray):
+        self.grams = grams
+        self.offsets = offsets
+        self.term_ids = term_ids
+
+    @classmethod
+    def build(cls, terms: list[str]) -> "TrigramIndex":
+        pairs = pd.DataFrame(
+            [(g, i) for i, term in enumerate(terms) for g in trigrams(term)],
+            columns=["gram", "term"],
+        )
+        codes, grams = pd.factorize(pairs["gram"], sort=True)
+        order = np.lexsort((pairs["term"].to_numpy(), codes))
+        term_ids = pairs["term"].to_numpy()[order].astype(np.int32)
+        offsets = np.searchsorted(codes[order], np.arange(len(grams) + 1))
+        return cls(list(grams), offsets, term_ids)
+
+    def candidates(self, word: str, n_terms: int, edits: int) -> np.ndarray:
+        """
+        Ids of terms sharing enough trigrams to be within edits of word.
+
+        One edit changes at most 3 trigrams, so a term within edits shares
+        at least len(trigrams(word)) - 3 * edits of them.
+        """
+        hits = []
+        for gram in trigrams(word):
+            i = bisect_left(self.grams, gram)
+            if i < len(self.grams) and self.grams[i] == gram:
+                hits.append(self.term_ids[self.offsets[i]:self.offsets[i + 1]])
+        need = max(1, len(trigrams(word)) - 3 * edits)
+        if not hits:
+            return np.zeros(0, dtype=np.int32)
+        counts = np.bincount(np.concatenate(hits), minlength=n_terms)
+        return np.flatnonzero(counts >= need)
+
+
+class SearchIndex:
+    """
+    Inverted index of one sheet, by row position.
+
+    terms:    sorted unique terms
+    offsets:  postings of terms[i] are postings[offsets[i]:offsets[i + 1]]
+    postings: row positions, ascending within each term
+    """
+
+    def __init__(self, terms: list[str], offsets: np.ndarray,
+                 postings: np.ndarray, size: int,
+                 names: "SearchIndex | None" = None,
+                 trigrams: TrigramIndex | None = None):
+        self.terms = terms
+        self.offsets = offsets
+        self.postings = postings
+        self.size = size
+        self.names = names          # index of NAME_COLUMNS, for fuzzy lookup
+        self.trigrams = trigrams    # trigrams of self.terms (names index only)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, columns=SEARCH_COLUMNS) -> "SearchIndex":
+        """The full index of df, with its brand / name index for fuzzy lookup."""
+        index = cls.build_columns(df, columns)
+        index.names = cls.build_columns(df, NAME_COLUMNS)
+        index.names.trigrams = TrigramIndex.build(index.names.terms)
+        return index
+
+    @classmethod
+    def build_columns(cls, df: pd.DataFrame, columns) -> "SearchIndex":
+        """Index the columns of df that exist, with column operations."""
+        words = [
+            df[col].astype(str).str.lower().str.findall(TOKEN_RE)
+            .set_axis(range(len(df))).explode().dropna()
+            for col in columns if col in df.columns
+        ]
+        if not words:
+            return cls([], np.zeros(1, dtype=np.int64),
+                       np.zeros(0, dtype=np.int32), len(df))
+
+        found = pd.concat(words)
+        pairs = pd.DataFrame({"term": found.to_numpy(dtype=object),
+                              "row": found.index.to_numpy()}).drop_duplicates()
+        codes, terms = pd.factorize(pairs["term"], sort=True)
+        order = np.lexsort((pairs["row"].to_numpy(), codes))
+        postings = pairs["row"].to_numpy()[order].astype(np.int32)
+        offsets = np.searchsorted(codes[order], np.arange(len(terms) + 1))
+        return cls(list(terms), offsets, postings, len(df))
+
+    def prefix_rows(self, prefix: str) -> np.ndarray:
+        """Sorted row positions with a term starting with prefix."""
+        lo = bisect_left(self.terms, prefix)
+        hi = bisect_left(self.terms, prefix + "\U0010ffff", lo)
+        if hi - lo == 1:
+            return self.postings[self.offsets[lo]:self.offsets[hi]]
+        return np.unique(self.postings[self.offsets[lo]:self.offsets[hi]])
+
+    def term_rows(self, term: str) -> np.ndarray:
+        """Sorted row positions containing exactly term."""
+        i = bisect_left(self.terms, term)
+        if i == len(self.terms) or self.terms[i] != term:
+            return np.zeros(0, dtype=np.int32)
+        return self.postings[self.offsets[i]:self.offsets[i + 1]]
+
+    def fuzzy_terms(self, word: str) -> list[str]:
+        """
+        Brand / name terms closest to word within max_edits(word) typos.
+
+        Candidates come from the trigram index; only they are compared.
+        """
+        names = self.names
+        edits = max_edits(word)
+        if names is None or names.trigrams is None or not edits:
+            return []
+        best, found = edits + 1, []
+        for i in names.trigrams.candidates(word, len(names.terms), edits):
+            d = edit_distance(word, names.terms[i], edits)
+            if d < best:
+                best, found = d, [names.terms[i]]
+            elif d == best:
+                found.append(names.terms[i])
+        return found if best <= edits else []
+
+    def fuzzy_rows(self, word: str) -> np.ndarray:
+        """Rows whose brand / name contains a close match of word."""
+        rows = [self.names.term_rows(term) for term in self.fuzzy_terms(word)]
+        if not rows:
+            return np.zeros(0, dtype=np.int32)
+        return np.unique(np.concatenate(rows))
+
+    def corrections(self, query: str) -> dict[str, list[str]]:
+        """Words of query with no match, and the terms they fuzzily match."""
+        return {
+            word: self.fuzzy_terms(word)
+            for word in dict.fromkeys(tokenize(query))
+            if not len(self.prefix_rows(word)) and self.fuzzy_terms(word)
+        }
+
+    def search(self, query: str, fuzzy: bool = True) -> np.ndarray:
+        """
+        Row positions (ascending) matching every word of query as a prefix.
+
+        With fuzzy, a word matching nothing falls back to fuzzy_rows.
+        An empty query matches every row.
+        """
+        rows = None
+        for word in dict.fromkeys(tokenize(query)):
+            found = self.prefix_rows(word)
+            if fuzzy and not len(found):
+                found = self.fuzzy_rows(word)
+            rows = found if rows is None else np.intersect1d(
+                rows, found, assume_unique=True)
+            if not len(rows):
+                break
+        if rows is None:
+            return np.arange(self.size)
+        return rows
+
+    # ---- persistence ----
+
+    def save(self, path) -> None:
+        """Write the index (and its names index) as one uncompressed .npz."""
+        arrays = {
+            "terms": _pack(self.terms),
+            "offsets": self.offsets,
+            "postings": self.postings,
+            "size": np.array([self.size]),
+        }
+        if self.names is not None and self.names.trigrams is not None:
+            grams = self.names.trigrams
+            arrays |= {
+                "names_terms": _pack(self.names.terms),
+                "names_offsets": self.names.offsets,
+                "names_postings": self.names.postings,
+                "grams": _pack(grams.grams),
+                "grams_offsets": grams.offsets,
+                "grams_term_ids": grams.term_ids,
+            }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path) -> "SearchIndex":
+        with np.load(path) as data:
+            size = int(data["size"][0])
+            index = cls(_unpack(data["terms"]), data["offsets"],
+                        data["postings"], size)
+            if "names_terms" in data:
+                index.names = cls(
+                    _unpack(data["names_terms"]), data["names_offsets"],
+                    data["names_postings"], size,
+                    trigrams=TrigramIndex(_unpack(data["grams"]),
+                                          data["grams_offsets"],
+                                          data["grams_term_ids"]),
+                )
+            return index
+
+
+def _pack(words: list[str]) -> np.ndarray:
+    """Words as one newline-separated utf-8 byte array (no pickling)."""
+    return np.frombuffer("\n".join(words).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack(blob: np.ndarray) -> list[str]:
+    text = blob.tobytes().decode("utf-8")
+    return text.split("\n") if text else []
+
+
+def _index_prefix(kind: str, source: str) -> str:
+    """Start of the saved index names of one kind of sheet from one source."""
+    return f"{kind}-{hashlib.sha1(source.encode('utf-8')).hexdigest()[:8]}"
+
+
+def index_file(df: pd.DataFrame, kind: str, version: str, source: str = ""):
+    """Where the index of a sheet version is saved; None if unversioned."""
+    if not version:
+        return None
+    columns = [c for c in SEARCH_COLUMNS if c in df.columns]
+    ident = json.dumps([SEARCH_FORMAT, kind, version, columns, len(df)])
+    tag = hashlib.sha1(ident.encode("utf-8")).hexdigest()[:16]
+    return SEARCH_DIR / f"{_index_prefix(kind, source)}-{tag}.npz"
+
+
+def sheet_index(df: pd.DataFrame, kind: str, version: str,
+                source: str = "") -> SearchIndex:
+    """
+    The search index of a sheet version: loaded if saved, else built.
+
+    A freshly built index replaces the saved ones of the same kind read
+    from the same source (the file's path); other sources keep theirs.
+    Disk failures are ignored: the saved copy is only a startup shortcut.
+    """
+    path = index_file(df, kind, version, source)
+    if path is not None and path.exists():
+        try:
+            return SearchIndex.load(path)
+        except (OSError, ValueError, KeyError):
+            pass
+
+    index = SearchIndex.build(df)
+    if path is not None:
+        try:
+            for old in SEARCH_DIR.glob(f"{_index_prefix(kind, source)}-*.npz"):
+                old.unlink(missing_ok=True)
+            index.save(path)
+        except OSError:
+            pass
+    return index
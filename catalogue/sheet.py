@@ -0,0 +1,282 @@
+"""A loaded sheet bundled with everything derived from it."""
+
+from dataclasses import dataclass, replace
+from functools import cached_property, partial
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .facets import FACET_COLUMNS, FacetIndex
+from .ingredients import IngredientIndex
+from .labels import (
+    ID_COL,
+    KEY_COLS,
+    make_base_keys,
+    make_labels,
+    number_repeats,
+    unique_labels,
+)
+from .loader import SHEET_CLO, SHEET_SUN, read_sheets, workbook_key
+from .parsing import is_typed_col
+from .ranges import SortedIndex
+from .ranking import RankIndex
+from .schema import (
+    ISSUE_COLUMNS,
+    SCHEMAS,
+    add_typed_columns,
+    schema_for,
+    validate,
+)
+from .search import SEARCH_COLUMNS, SearchIndex, sheet_index
+
+# Columns the app reads (labels, keys, schema fields, tables, images,
+# search, facets); the loaders skip the rest of the sheet
+USED_COLUMNS = list(dict.fromkeys([
+    "Product Brand",
+    "Product Name",
+    ID_COL,
+    *KEY_COLS,
+    *(f.column for schema in SCHEMAS.values() for f in schema),
+    "Price / ml",
+    "Image",
+    *SEARCH_COLUMNS,
+    *FACET_COLUMNS,
+]))
+
+
+@dataclass
+class SheetData:
+    """
+    One catalogue sheet and its derived structures, built once per load.
+
+    df:        raw text columns + parsed number / date shadow columns
+    keys:      stable unique key per row (see make_keys)
+    labels:    unique display label per row
+    positions: key -> row position
+    version:   content hash of the source the sheet was read from
+    hashes:    hash of each row's raw cells (see update_sheet)
+    base_labels: labels before unique_labels disambiguated them
+    issues:    schema validation report (see schema.validate)
+    base_keys: keys before repeats were numbered (see labels.make_base_keys)
+    source:    path of the file the sheet was read from (names its saved
+               search index)
+    """
+    df: pd.DataFrame
+    kind: str
+    keys: pd.Series
+    labels: pd.Series
+    positions: dict
+    version: str = ""
+    hashes: np.ndarray | None = None
+    base_labels: pd.Series | None = None
+    issues: pd.DataFrame | None = None
+    base_keys: pd.Series | None = None
+    source: str = ""
+
+    @property
+    def empty(self) -> bool:
+        return self.df.empty
+
+    def rows(self, chosen_keys) -> pd.DataFrame:
+        """Rows for the chosen keys, in sheet order."""
+        return self.df.iloc[sorted(self.positions[k] for k in chosen_keys
+                                   if k in self.positions)]
+
+    def label(self, key: str) -> str:
+        return self.labels.iat[self.positions[key]]
+
+    @cached_property
+    def ranges(self) -> SortedIndex:
+        """Sorted metric arrays for range filters, built on first use."""
+        return SortedIndex.for_sheet(self.df, self.kind)
+
+    @cached_property
+    def ranking(self) -> RankIndex:
+        """Percentile scores for top-N queries, over self.ranges."""
+        return RankIndex(self.df, self.kind, self.ranges)
+
+    @cached_property
+    def search(self) -> SearchIndex:
+        """Full-text index of the text columns, saved per sheet version."""
+        return sheet_index(self.df, self.kind, self.version, self.source)
+
+    @cached_property
+    def ingredients(self) -> IngredientIndex:
+        """Per-ingredient row bitmaps of the Ingredients List column."""
+        return IngredientIndex(self.df)
+
+    @cached_property
+    def facets(self) -> FacetIndex:
+        """Factorised brand / shop / material / band codes for facet counts."""
+        return FacetIndex(self.df, self.kind)
+
+    INDEXES = ("ranges", "ranking", "search", "ingredients", "facets")
+
+    def warm(self) -> "SheetData":
+        """Build the lazy indexes now (e.g. in a loader thread), not on use."""
+        for index in self.INDEXES:
+            getattr(self, index)
+        return self
+
+    def with_version(self, version: str) -> "SheetData":
+        """This sheet under a new version, keeping the indexes already built."""
+        sheet = replace(self, version=version)
+        sheet.__dict__.update({name: self.__dict__[name]
+                               for name in self.INDEXES
+                               if name in self.__dict__})
+        return sheet
+
+
+def raw_columns(df: pd.DataFrame) -> list[str]:
+    """The sheet's own columns, without the parsed shadow columns."""
+    return [c for c in df.columns if not is_typed_col(c)]
+
+
+def row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """uint64 hash of every row's raw cells."""
+    return pd.util.hash_pandas_object(df[raw_columns(df)], index=False,
+                                      categorize=False).to_numpy()
+
+
+def build_sheet(df: pd.DataFrame, kind: str, version: str = "",
+                source: str = "") -> SheetData:
+    """Derive keys, labels, the key index and the issue report for a sheet."""
+    base_keys = make_base_keys(df)
+    keys = number_repeats(base_keys)
+    base_labels = make_labels(df, kind)
+    labels = unique_labels(base_labels, keys)
+    positions = dict(zip(keys, range(len(keys))))
+    issues = validate(df, schema_for(kind), keys)
+    return SheetData(df, kind, keys, labels, positions, version,
+                     row_hashes(df), base_labels, issues, base_keys, source)
+
+
+def update_sheet(previous: SheetData | None, raw: pd.DataFrame, kind: str,
+                 version: str = "", source: str = "") -> SheetData:
+    """
+    SheetData for a re-read sheet (raw text columns), reusing previous.
+
+    Rows are matched to previous by the hash of their raw cells: a row
+    whose content is unchanged (wherever it moved) carries over its typed
+    columns, label, base key and validation issues, and only added or
+    changed rows are parsed, keyed, labelled and validated. Numbering
+    repeated keys / labels and the key index are redone for the whole
+    sheet, since they depend on every row. An unchanged sheet keeps its
+    built indexes too. Without a compatible previous sheet (first load,
+    different columns) this is build_sheet.
+    """
+    if (previous is None or previous.hashes is None
+            or previous.base_keys is None
+            or previous.kind != kind or previous.source != source
+            or raw_columns(previous.df) != list(raw.columns)):
+        return build_sheet(add_typed_columns(raw, schema_for(kind)), kind,
+                           version, source)
+
+    hashes = row_hashes(raw)
+    # First previous row with each content; repeats carry over from it
+    first = ~pd.Index(previous.hashes).duplicated()
+    src = pd.Index(previous.hashes[first]).get_indexer(hashes)
+    same = src >= 0
+    src = np.flatnonzero(first)[src[same]]
+    if same.all() and np.array_equal(src, np.arange(len(previous.df))):
+        return previous.with_version(version)
+
+    kept = np.flatnonzero(same)
+    fresh = np.flatnonzero(~same)
+    fresh_rows = add_typed_columns(raw.iloc[fresh], schema_for(kind))
+    typed_cols = [c for c in previous.df.columns if is_typed_col(c)]
+
+    def merge(carried, new):
+        """Carried values at kept, new values at fresh, as one Series / frame."""
+        out = pd.concat([carried.set_axis(raw.index[kept]),
+                         new.set_axis(raw.index[fresh])])
+        return out.reindex(raw.index)
+
+    df = pd.concat([raw, merge(previous.df[typed_cols].iloc[src],
+                               fresh_rows[typed_cols])], axis=1)
+    base_keys = merge(previous.base_keys.iloc[src],
+                      make_base_keys(fresh_rows))
+    keys = number_repeats(base_keys)
+    base_labels = merge(previous.base_labels.iloc[src],
+                        make_labels(fresh_rows, kind))
+    labels = unique_labels(base_labels, keys)
+    positions = dict(zip(keys, range(len(keys))))
+    found = [carry_issues(previous.issues, src, kept, keys),
+             validate(fresh_rows, schema_for(kind), keys.iloc[fresh], fresh)]
+    found = [f for f in found if len(f)]
+    issues = (pd.DataFrame(columns=ISSUE_COLUMNS) if not found
+              else pd.concat(found, ignore_index=True).sort_values(
+                  "Row", kind="stable", na_position="first",
+                  ignore_index=True))
+    return SheetData(df, kind, keys, labels, positions, version, hashes,
+                     base_labels, issues, base_keys, source)
+
+
+def carry_issues(issues: pd.DataFrame, src: np.ndarray, kept: np.ndarray,
+                 keys: pd.Series) -> pd.DataFrame:
+    """
+    Row issues of previous rows src, moved to their new positions kept.
+
+    Sheet-level issues (no Row) are left out: validating the fresh rows
+    reports them again.
+    """
+    moved = pd.DataFrame({"old": src + 2, "new": kept})
+    carried = issues[issues["Row"].notna()].merge(
+        moved, left_on="Row", right_on="old", sort=False)
+    carried = carried.sort_values("new", kind="stable")
+    return pd.DataFrame({
+        "Row": carried["new"].to_numpy() + 2,
+        "Key": keys.iloc[carried["new"]].to_numpy(),
+        "Column": carried["Column"].to_numpy(),
+        "Value": carried["Value"].to_numpy(),
+        "Problem": carried["Problem"].to_numpy(),
+    }, columns=ISSUE_COLUMNS)
+
+
+# Sheet name -> label kind for the whole catalogue
+CATALOGUE_SHEETS = {SHEET_SUN: "sun", SHEET_CLO: "cloth"}
+
+
+def load_each(builders: dict, previous: dict[str, SheetData],
+              errors: dict[str, str] | None = None) -> dict[str, SheetData]:
+    """
+    builders[name]() for every sheet, one sheet at a time.
+
+    With errors, a sheet whose builder raises keeps its previous SheetData
+    (or is left out if it had none) and errors[name] says why, so one bad
+    sheet doesn't take the others down. Without, the exception propagates.
+    """
+    loaded = {}
+    for name, build in builders.items():
+        try:
+            loaded[name] = build()
+        except Exception as e:
+            if errors is None:
+                raise
+            errors[name] = f"{type(e).__name__}: {e}"
+            if name in previous:
+                loaded[name] = previous[name]
+    return loaded
+
+
+def load_catalogue(path: Path,
+                   sheets: dict[str, str] = CATALOGUE_SHEETS,
+                   previous: dict[str, SheetData] | None = None,
+                   errors: dict[str, str] | None = None) -> dict[str, SheetData]:
+    """
+    Every sheet in sheets (name -> kind) from one pass over the workbook.
+
+    Sheets missing from the workbook are left out of the result. With the
+    previous load's sheets, only changed rows are re-derived (update_sheet).
+    With errors, sheets that fail to build are handled as in load_each.
+    """
+    previous = previous or {}
+    key = workbook_key(path)
+    frames = read_sheets(path, list(sheets), key, USED_COLUMNS)
+    builders = {
+        name: partial(update_sheet, previous.get(name), df, sheets[name],
+                      key["sha256"], key["path"])
+        for name, df in frames.items()
+    }
+    return load_each(builders, previous, errors)
@@ -0,0 +1,221 @@
+"""
+Where the catalogue is read from: the Excel workbook or CSV exports.
+
+A data source turns files on disk into {sheet name: SheetData}. The
+workbook is the reference layout; CSV files with their own schema are
+mapped onto the workbook's headers column by column (see CsvColumn), so
+everything downstream sees the same sheets whichever source is used.
+
+    open_source("photoprotection_catalogue_template.xlsx")
+    open_source(".")          # sunscreens.csv + clothing.csv in a directory
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Protocol
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+
+from .labels import ID_COL
+from .loader import BASE_DIR, DATA_XLSX, SHEET_CLO, SHEET_SUN
+from .parsing import to_float_series
+from .sheet import (
+    CATALOGUE_SHEETS,
+    SheetData,
+    load_catalogue,
+    load_each,
+    update_sheet,
+)
+
+
+class DataSource(Protocol):
+    name: str
+
+    def paths(self) -> list[Path]:
+        ...
+
+    def load(self, previous: dict[str, SheetData] | None = None,
+             errors: dict[str, str] | None = None) -> dict[str, SheetData]:
+        ...
+
+
+@dataclass
+class WorkbookSource:
+    """The Excel workbook, read in one pass (see load_catalogue)."""
+    path: Path = DATA_XLSX
+    sheets: dict[str, str] = field(default_factory=lambda: dict(CATALOGUE_SHEETS))
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def paths(self) -> list[Path]:
+        return [self.path]
+
+    def load(self, previous: dict[str, SheetData] | None = None,
+             errors: dict[str, str] | None = None) -> dict[str, SheetData]:
+        return load_catalogue(self.path, self.sheets, previous, errors)
+
+
+@dataclass(frozen=True)
+class CsvColumn:
+    """
+    One CSV column mapped onto a workbook header.
+
+    scale multiplies the parsed number (e.g. 0.01 for percent -> fraction);
+    cells that don't parse are left empty.
+    prefix is put before non-empty cells. Several columns may share a
+    target; their non-empty cells are joined with "; ".
+    """
+    source: str
+    target: str
+    scale: float | None = None
+    prefix: str = ""
+
+
+SUN_CSV_COLUMNS = [
+    CsvColumn("id", ID_COL),
+    CsvColumn("brand", "Product Brand"),
+    CsvColumn("name", "Product Name"),
+    CsvColumn("size_ml", "Volume (ml)"),
+    CsvColumn("price_gbp", "Price (£)"),
+    CsvColumn("spf_measured", "SPF (lab)"),
+    CsvColumn("uva_pf", "UVA Protection (Lab)"),
+    CsvColumn("block_HEV", "Blue Light Protection (lab)", scale=0.01),
+    CsvColumn("block_VIS", "Visible Protection (lab)", scale=0.01),
+    CsvColumn("filters", "Any Additional Claims", prefix="Filters: "),
+    CsvColumn("porphyria_note", "Any Additional Claims"),
+    CsvColumn("image", "Image"),
+]
+
+# Clothing exports carry UPF rather than SPF; the workbook keeps it in SPF (lab)
+CLO_CSV_COLUMNS = [
+    CsvColumn("id", ID_COL),
+    CsvColumn("brand", "Product Brand"),
+    CsvColumn("label", "Product Name"),
+    CsvColumn("material", "Material"),
+    CsvColumn("price_gbp", "Price (£)"),
+    CsvColumn("upf_measured", "SPF (lab)"),
+    CsvColumn("block_HEV", "Blue Light Protection (lab)", scale=0.01),
+    CsvColumn("block_VIS", "Visible Protection (lab)", scale=0.01),
+    CsvColumn("notes", "Any Additional Claims"),
+    CsvColumn("image", "Image"),
+]
+
+
+@dataclass(frozen=True)
+class CsvSheet:
+    """A catalogue sheet stored as one CSV file."""
+    filename: str
+    kind: str
+    columns: tuple[CsvColumn, ...]
+
+
+CSV_SHEETS = {
+    SHEET_SUN: CsvSheet("sunscreens.csv", "sun", tuple(SUN_CSV_COLUMNS)),
+    SHEET_CLO: CsvSheet("clothing.csv", "cloth", tuple(CLO_CSV_COLUMNS)),
+}
+
+
+def read_csv(path: Path, columns) -> pd.DataFrame:
+    """
+    A CSV file as text columns named after the workbook headers.
+
+    Parsed by pyarrow's multithreaded reader with every mapped column typed
+    as string (no type inference); unmapped columns are never materialised.
+    Mapped columns missing from the file come back empty.
+    """
+    columns = list(columns)
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(use_threads=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={c.source: pa.string() for c in columns},
+            include_columns=[c.source for c in columns],
+            include_missing_columns=True,
+        ),
+    )
+    raw = table.to_pandas()
+
+    out = {}
+    for c in columns:
+        text = raw[c.source].fillna("").astype(str).str.strip()
+        if c.scale is not None:
+            values = (to_float_series(text) * c.scale).round(10)
+            text = values.astype(str).where(values.notna(), "")
+        if c.prefix:
+            text = (c.prefix + text).where(text != "", "")
+        if c.target in out:
+            before = out[c.target]
+            sep = pd.Series("; ", index=text.index).where(
+                (before != "") & (text != ""), "")
+            text = before + sep + text
+        out[c.target] = text
+    return pd.DataFrame(out, index=raw.index)
+
+
+def file_digest(paths) -> str:
+    """sha256 over the contents of several files, in order."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as fh:
+            for chunk in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CsvSource:
+    """One CSV file per sheet in a directory, mapped through CSV_SHEETS."""
+    directory: Path = BASE_DIR
+    sheets: dict[str, CsvSheet] = field(default_factory=lambda: dict(CSV_SHEETS))
+
+    @property
+    def name(self) -> str:
+        return ", ".join(s.filename for s in self.sheets.values())
+
+    def paths(self) -> list[Path]:
+        return [self.directory / s.filename for s in self.sheets.values()]
+
+    def load(self, previous: dict[str, SheetData] | None = None,
+             errors: dict[str, str] | None = None) -> dict[str, SheetData]:
+        """
+        Every sheet whose CSV file exists; missing files are left out.
+
+        With the previous load's sheets, only changed rows are re-derived.
+        With errors, a file that fails to load only fails its own sheet
+        (see load_each).
+        """
+        previous = previous or {}
+        builders = {
+            name: partial(self._load_sheet, path, spec, previous.get(name))
+            for (name, spec), path in zip(self.sheets.items(), self.paths())
+            if path.exists()
+        }
+        return load_each(builders, previous, errors)
+
+    @staticmethod
+    def _load_sheet(path: Path, spec: CsvSheet,
+                    previous: SheetData | None) -> SheetData:
+        return update_sheet(previous, read_csv(path, spec.columns), spec.kind,
+                            file_digest([path]), str(path.resolve()))
+
+
+def open_source(location: str | Path | None = None) -> DataSource:
+    """
+    The data source at location: a directory of CSV exports, or a workbook.
+
+    None (or "") means the bundled workbook, DATA_XLSX.
+    """
+    if not location:
+        return WorkbookSource()
+    path = Path(location)
+    if not path.is_absolute():
+        path = BASE_DIR / path
+    if path.is_dir():
+        return CsvSource(path)
+    return WorkbookSource(path)
@@ -0,0 +1,116 @@
+"""
+The live catalogue: the current snapshot of a data source, kept fresh.
+
+A watcher thread polls the source's files (mtime + size) and re-parses
+them in the background when they change, including the sheets' lazy
+indexes (ranking, search, ingredients); the new snapshot then replaces
+the old one with a single reference swap. Readers take snapshot() once
+and use it for the whole request, so they never see half-loaded data
+and never wait for a re-parse.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+
+from .sheet import SheetData, load_each
+
+POLL_SECONDS = 2.0
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    One consistent load of the catalogue.
+
+    sheets:    sheet name -> SheetData (treat as read-only)
+    version:   changes whenever any sheet's content changes
+    loaded_at: time.time() of the load
+    error:     why the last load failed, if it did (sheets are then the
+               previous snapshot's)
+    errors:    sheet name -> why that sheet failed to load; it keeps its
+               previous version if it had one, the other sheets load as usual
+    """
+    sheets: dict[str, SheetData] = field(default_factory=dict)
+    version: str = ""
+    loaded_at: float = 0.0
+    error: str = ""
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def file_stamps(paths) -> tuple:
+    """(path, mtime_ns, size) per path; None for files that don't exist."""
+    stamps = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except OSError:
+            stamps.append((str(path), None))
+            continue
+        stamps.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+class CatalogueStore:
+    """
+    Current Snapshot of a data source, reloaded in the background.
+
+    The first load runs in the constructor; after start() a daemon thread
+    polls source.paths() every interval seconds and reloads when a file
+    changed. A failed reload keeps the previous sheets and records the
+    error, and is retried on the next change; a sheet that fails on its
+    own (building or warming it) does so without holding back the others.
+    """
+
+    def __init__(self, source, interval: float = POLL_SECONDS):
+        self.source = source
+        self.interval = interval
+        self._stamps = file_stamps(source.paths())
+        self._snapshot = self._load(Snapshot())
+        self._stop = threading.Event()
+        self._thread = None
+
+    def snapshot(self) -> Snapshot:
+        return self._snapshot
+
+    def _load(self, previous: Snapshot) -> Snapshot:
+        errors = {}
+        try:
+            sheets = self.source.load(previous.sheets, errors)
+        except Exception as e:
+            return Snapshot(previous.sheets, previous.version, previous.loaded_at,
+                            f"{type(e).__name__}: {e}", previous.errors)
+        warmed = {name: sheet.warm for name, sheet in sheets.items()}
+        sheets = load_each(warmed, previous.sheets, errors)
+        version = "/".join(s.version for s in sheets.values())
+        return Snapshot(sheets, version, time.time(), errors=errors)
+
+    def refresh(self) -> bool:
+        """Reload if the source's files changed; True if they had."""
+        stamps = file_stamps(self.source.paths())
+        if stamps == self._stamps:
+            return False
+        self._stamps = stamps
+        self._snapshot = self._load(self._snapshot)
+        return True
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                pass  # keep watching; the next change triggers another try
+
+    def start(self) -> "CatalogueStore":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._watch, name="catalogue-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
@@ -0,0 +1,325 @@
+"""
+Synthetic Sunscreens / Clothing sheets for load and soak testing.
+
+Rows use the same headers as the template workbook and the same kind of
+mess curators produce: '50+', '12%', 'N/A' / 'na' / blanks, repeated
+batch IDs and products sharing brand, name and volume, and a mix of
+local and URL images.
+
+    python -m catalogue.synth --rows 10000 --format xlsx --out big.xlsx
+    python -m catalogue.synth --rows 100000 --format parquet --out big
+
+csv / parquet write one file per sheet: <out>-Sunscreens.csv etc.
+"""
+
+import argparse
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .loader import SHEET_CLO, SHEET_SUN
+
+COMMON_HEADERS = [
+    "Date of Entry",
+    "Product Brand",
+    "Product Name",
+    "ID if any (Batch, Serial etc)",
+    "SPF (label)",
+    "Blue Light Protection (Label)",
+    "Visible Protection (label)",
+    "UVA Protection (Label)",
+    "Any Additional Claims",
+    "Volume (ml)",
+    "Price (£)",
+    "Price / ml",
+    "Purchased from",
+    "RRP",
+]
+
+LAB_HEADERS = [
+    "Lab Testing Date",
+    "Date Opened",
+    "ID marks",
+    "SPF (lab)",
+    "Blue Light Protection (lab)",
+    "Visible Protection (lab)",
+    "UVA Protection (Lab)",
+    "Image",
+    "Tested By (Person / Institute)",
+]
+
+SUN_HEADERS = ["ID"] + COMMON_HEADERS + ["Ingredients List"] + LAB_HEADERS
+CLO_HEADERS = ["Version"] + COMMON_HEADERS + ["Material", "Coatings"] + LAB_HEADERS
+
+SUN_BRANDS = [
+    "La Roche-Posay", "Nivea", "Garnier", "Boots Soltan", "Ultrasun",
+    "Altruist", "Bioderma", "Avène", "Eucerin", "Heliocare", "Tesco",
+    "Sainsbury's", "Neutrogena", "Mystery",
+]
+SUN_LINES = [
+    "Anthelios", "Protect & Moisture", "Ambre Solaire", "Kids", "Dermatologist",
+    "Photoderm", "Sun Sensitive", "UVMune", "Hydro Fluid", "Mineral",
+]
+SUN_FORMS = ["Lotion", "Fluid", "Spray", "Cream", "Roll-On", "Stick", "Gel"]
+VOLUMES = ["30", "40", "50", "75", "100", "150", "200", "250", "400"]
+
+CLO_BRANDS = [
+    "Tesco", "Craghoppers", "Columbia", "Uniqlo", "Rash Guard Co",
+    "Patagonia", "Decathlon", "Regatta", "Mountain Warehouse", "Mystery",
+]
+CLO_ITEMS = [
+    "Everyday T-Shirt", "Adventure Shirt", "Sun Hoodie", "Rash Vest",
+    "Wide Brim Hat", "Arm Sleeves", "Long Sleeve Tee", "Swim Leggings",
+]
+CLO_VARIANTS = ["(White, S)", "(White, L)", "(Beige, M)", "(Navy, L)", "(Black, M)"]
+MATERIALS = [
+    "100% Cotton", "94% Polyamide / 6% Elastane", "100% Nylon ripstop",
+    "100% Polyester", "80% Nylon / 20% Spandex", "Linen blend",
+]
+COATINGS = ["", "", "Permethrin coating", "Omni-Shade chemical treatment",
+            "Titanium dioxide finish"]
+
+UV_FILTERS = [
+    "Octocrylene", "Homosalate", "Butyl Methoxydibenzoylmethane",
+    "Ethylhexyl Salicylate", "Bis-Ethylhexyloxyphenol Methoxyphenyl Triazine",
+    "Tinosorb S", "Tinosorb M", "Mexoryl 400", "Mexoryl SX",
+    "Diethylamino Hydroxybenzoyl Hexyl Benzoate", "Ethylhexyl Triazone",
+    "Zinc Oxide", "Titanium Dioxide", "Avobenzone", "Octinoxate",
+]
+EXCIPIENTS = [
+    "Glycerin", "Cyclopentasiloxane", "Dimethicone", "Alcohol Denat.",
+    "Tocopherol", "Parfum", "Niacinamide", "Iron Oxides", "Silica",
+]
+CLAIMS = [
+    "", "Invisible fluid, fragrance-free", "Budget family protection",
+    "For severe photosensitivity / porphyria", "Water resistant 4 hours",
+    "Insect-repellent fabric with UV defence", "Reef friendly",
+]
+SHOPS = ["Tesco", "Boots Online", "Specialist Clinic", "Amazon", "Superdrug",
+         "Go Outdoors", "Pharmacy"]
+LABS = ["Dundee Photobiology Unit", "Wellman Center / Dundee Collab",
+        "MLRF / Dundee Lab", "Dundee Photobiology Unit / Ewan Eadie"]
+NA_VALUES = ["", "N/A", "na", "none"]
+
+LOCAL_IMAGES = [f"Images/{i:04d}.png" for i in range(1, 7)]
+URL_IMAGE = "https://images.example.org/catalogue/{}.png"
+
+
+def _messy(values, rng: np.random.Generator, rate: float) -> np.ndarray:
+    """Replace a `rate` share of values with blanks / NA tokens."""
+    values = np.asarray(values, dtype=object)
+    hit = rng.random(len(values)) < rate
+    values[hit] = rng.choice(NA_VALUES, hit.sum())
+    return values
+
+
+def _numbers(rng, low, high, n, decimals) -> np.ndarray:
+    return np.round(rng.uniform(low, high, n), decimals)
+
+
+def _text(values) -> np.ndarray:
+    """Numbers as the text the workbook stores ('50' rather than '50.0')."""
+    out = pd.Series(values).astype(str).str.removesuffix(".0")
+    return out.to_numpy(dtype=object)
+
+
+def _dates(rng, n, start=date(2023, 1, 1), days=1000) -> np.ndarray:
+    offsets = rng.integers(0, days, n)
+    return np.array([(start + timedelta(days=int(d))).isoformat() for d in offsets],
+                    dtype=object)
+
+
+def _suffixed(values, rng, rate, suffix) -> np.ndarray:
+    """Append suffix ('+', '%') to a `rate` share of values."""
+    values = np.asarray(values, dtype=object)
+    hit = rng.random(len(values)) < rate
+    values[hit] = values[hit] + suffix
+    return values
+
+
+def _percent_typos(fractions, rng, rate) -> np.ndarray:
+    """Fractions as text, with a `rate` share typed as percentages ('12%')."""
+    values = _text(fractions)
+    hit = rng.random(len(values)) < rate
+    values[hit] = _text(np.round(fractions[hit] * 100, 1)) + "%"
+    return values
+
+
+def _images(rng, n, url_rate, blank_rate) -> np.ndarray:
+    local = rng.choice(LOCAL_IMAGES, n).astype(object)
+    urls = np.array([URL_IMAGE.format(i) for i in range(n)], dtype=object)
+    draw = rng.random(n)
+    out = np.where(draw < url_rate, urls, local)
+    out[draw > 1 - blank_rate] = ""
+    return out
+
+
+def _ingredients(rng, n) -> np.ndarray:
+    out = []
+    for _ in range(n):
+        filters = rng.choice(UV_FILTERS, rng.integers(1, 5), replace=False)
+        parts = ["Aqua"]
+        for f in filters:
+            if f in ("Zinc Oxide", "Titanium Dioxide") and rng.random() < 0.5:
+                parts.append(f"{f} {rng.integers(3, 26)}%")
+            else:
+                parts.append(str(f))
+        parts += list(rng.choice(EXCIPIENTS, rng.integers(1, 4), replace=False))
+        if rng.random() < 0.5:
+            parts.append("etc.")
+        out.append(", ".join(parts))
+    return np.array(out, dtype=object)
+
+
+def _duplicate(df: pd.DataFrame, cols, rng, rate) -> pd.DataFrame:
+    """Copy cols from earlier rows into a `rate` share of rows."""
+    n = len(df)
+    hit = np.flatnonzero(rng.random(n) < rate)
+    hit = hit[hit > 0]
+    src = (rng.random(len(hit)) * hit).astype(int)
+    for col in cols:
+        values = df[col].to_numpy(copy=True)
+        values[hit] = values[src]
+        df[col] = values
+    return df
+
+
+def _common(rng, n, brands, names, volumes, price, messy) -> dict:
+    prices = _numbers(rng, *price, n, 2)
+    vol = rng.choice(volumes, n) if volumes else np.full(n, "", dtype=object)
+    vol_f = pd.to_numeric(pd.Series(vol), errors="coerce").to_numpy()
+    per_ml = np.where(vol_f > 0, np.round(prices / np.where(vol_f > 0, vol_f, 1), 4),
+                      np.nan)
+    brand = rng.choice(brands, n).astype(object)
+    batch = np.array([f"{b[:3].upper()}-{i:06d}" for i, b in enumerate(brand)],
+                     dtype=object)
+    return {
+        "Date of Entry": _dates(rng, n),
+        "Product Brand": brand,
+        "Product Name": names,
+        "ID if any (Batch, Serial etc)": _messy(batch, rng, messy),
+        "SPF (label)": _messy(_suffixed(rng.choice(["15", "30", "50"], n),
+                                        rng, 0.3, "+"), rng, messy),
+        "Blue Light Protection (Label)": rng.choice(
+            ["", "Blue Light Filter Tech", "Full Spectrum", "Moderate", "N/A"], n),
+        "Visible Protection (label)": rng.choice(
+            ["", "Opaque Barrier", "Tinted", "Moderate", "N/A"], n),
+        "UVA Protection (Label)": rng.choice(
+            ["", "UVA ** (marketing)", "UVA PF 46 (label)", "UVA circle", "0.9"], n),
+        "Any Additional Claims": rng.choice(CLAIMS, n).astype(object),
+        "Volume (ml)": _messy(vol, rng, messy),
+        "Price (£)": _messy(_text(prices), rng, messy / 2),
+        "Price / ml": _text(np.where(np.isnan(per_ml), "", per_ml)),
+        "Purchased from": _messy(rng.choice(SHOPS, n), rng, messy),
+        "RRP": _text(np.round(prices * rng.uniform(1.0, 1.6, n), 2)),
+    }
+
+
+def _lab(rng, n, spf, url_rate, messy) -> dict:
+    blue = _text(_numbers(rng, 0.0, 0.6, n, 3))
+    return {
+        "Lab Testing Date": _dates(rng, n, start=date(2024, 1, 1), days=600),
+        "Date Opened": _dates(rng, n, start=date(2024, 1, 1), days=600),
+        "ID marks": np.array([f"LAB-{chr(65 + i % 26)}{i % 100:02d}"
+                              for i in range(n)], dtype=object),
+        "SPF (lab)": _messy(_suffixed(_text(_numbers(rng, *spf, n, 0)),
+                                      rng, 0.05, "+"), rng, messy),
+        "Blue Light Protection (lab)": _messy(blue, rng, messy),
+        "Visible Protection (lab)": _messy(_percent_typos(
+            _numbers(rng, 0.0, 0.5, n, 3), rng, 0.02), rng, messy),
+        "UVA Protection (Lab)": _messy(_text(_numbers(rng, 1, 60, n, 0)),
+                                       rng, messy),
+        "Image": _images(rng, n, url_rate, blank_rate=0.05),
+        "Tested By (Person / Institute)": _messy(rng.choice(LABS, n), rng, messy),
+    }
+
+
+def sunscreens(n: int, seed: int = 0, url_rate: float = 0.2,
+               messy: float = 0.08, dup_rate: float = 0.05) -> pd.DataFrame:
+    """n synthetic Sunscreens rows with the template's headers."""
+    rng = np.random.default_rng(seed)
+    names = np.char.add(np.char.add(rng.choice(SUN_LINES, n), " "),
+                        rng.choice(SUN_FORMS, n)).astype(object)
+    data = {"ID": np.arange(1, n + 1).astype(str).astype(object)}
+    data |= _common(rng, n, SUN_BRANDS, names, VOLUMES, (3, 40), messy)
+    data["Ingredients List"] = _ingredients(rng, n)
+    data |= _lab(rng, n, (5, 120), url_rate, messy)
+    df = pd.DataFrame(data, columns=SUN_HEADERS)
+    return _duplicate(df, ["Product Brand", "Product Name", "Volume (ml)",
+                           "ID if any (Batch, Serial etc)"], rng, dup_rate)
+
+
+def clothing(n: int, seed: int = 1, url_rate: float = 0.2,
+             messy: float = 0.08, dup_rate: float = 0.05) -> pd.DataFrame:
+    """n synthetic Clothing rows with the template's headers."""
+    rng = np.random.default_rng(seed)
+    names = np.char.add(np.char.add(rng.choice(CLO_ITEMS, n), " "),
+                        rng.choice(CLO_VARIANTS, n)).astype(object)
+    data = {"Version": np.full(n, "1", dtype=object)}
+    data |= _common(rng, n, CLO_BRANDS, names, [], (2, 120), messy)
+    data["Material"] = rng.choice(MATERIALS, n).astype(object)
+    data["Coatings"] = rng.choice(COATINGS, n).astype(object)
+    data |= _lab(rng, n, (5, 150), url_rate, messy)
+    df = pd.DataFrame(data, columns=CLO_HEADERS)
+    return _duplicate(df, ["Product Brand", "Product Name", "Material"],
+                      rng, dup_rate)
+
+
+def catalogue(n: int, seed: int = 0, **kwargs) -> dict[str, pd.DataFrame]:
+    """Both sheets, n rows each, keyed by sheet name."""
+    return {
+        SHEET_SUN: sunscreens(n, seed, **kwargs),
+        SHEET_CLO: clothing(n, seed + 1, **kwargs),
+    }
+
+
+def write_catalogue(sheets: dict[str, pd.DataFrame], out: Path,
+                    fmt: str = "xlsx") -> list[Path]:
+    """Write sheets as one xlsx workbook or one csv / parquet file per sheet."""
+    out = Path(out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "xlsx":
+        path = out.with_suffix(".xlsx")
+        with pd.ExcelWriter(path, engine="openpyxl") as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+        return [path]
+
+    written = []
+    for name, df in sheets.items():
+        path = out.with_name(f"{out.stem}-{name}.{fmt}")
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "parquet":
+            df.to_parquet(path, index=False)
+        else:
+            raise ValueError(f"Unknown format {fmt!r}")
+        written.append(path)
+    return written
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalogue.")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--format", choices=["xlsx", "csv", "parquet"],
+                        default="xlsx")
+    parser.add_argument("--out", type=Path, default=Path("synthetic_catalogue"))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--url-rate", type=float, default=0.2,
+                        help="share of rows with an http(s) image")
+    parser.add_argument("--messy", type=float, default=0.08,
+                        help="share of cells replaced by blanks / NA tokens")
+    parser.add_argument("--dup-rate", type=float, default=0.05,
+                        help="share of rows repeating an earlier product")
+    args = parser.parse_args(argv)
+
+    sheets = catalogue(args.rows, args.seed, url_rate=args.url_rate,
+                       messy=args.messy, dup_rate=args.dup_rate)
+    for path in write_catalogue(sheets, args.out, args.format):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Thumbnail derivatives for the product image strip.
+
+Images are shrunk once to THUMB_WIDTH (and 2x for high-DPI screens) and
+stored under a content-addressed cache directory, so the browser gets a
+few KB per product instead of the full-size file.
+
+Pre-build every thumbnail referenced by the workbook with:
+
+    python -m catalogue.thumbnails [path/to/workbook.xlsx]
+"""
+
+import hashlib
+import os
+import sys
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    from PIL import Image, features
+except ImportError:  # thumbnails are optional; the strip falls back to originals
+    Image = None
+
+from .loader import CACHE_DIR, DATA_XLSX, SHEET_CLO, SHEET_SUN, read_sheets
+
+THUMB_DIR = CACHE_DIR / "thumbs"
+THUMB_WIDTH = 120
+THUMB_SCALES = (1, 2)
+
+
+def _thumb_format() -> tuple[str, str]:
+    """(Pillow format, file suffix): WebP when available, else PNG."""
+    if Image is not None and features.check("webp"):
+        return "WEBP", ".webp"
+    return "PNG", ".png"
+
+
+@lru_cache(maxsize=4096)
+def _digest(path: str, mtime_ns: int, size: int) -> str:
+    """sha256 of a file; memoised on (path, mtime, size) to skip re-reads."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def content_hash(path: Path) -> str:
+    stat = path.stat()
+    return _digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def thumbnail(source: Path, width: int = THUMB_WIDTH, scale: int = 2,
+              cache_dir: Path = THUMB_DIR) -> Path | None:
+    """
+    Path of the cached thumbnail of source at width * scale pixels wide.
+
+    Built on first use. Returns None when Pillow is missing or the source
+    can't be read as an image; callers then fall back to the original.
+    """
+    if Image is None:
+        return None
+    try:
+        digest = content_hash(source)
+    except OSError:
+        return None
+
+    fmt, suffix = _thumb_format()
+    pixels = width * scale
+    out = cache_dir / digest[:2] / f"{digest}-{pixels}{suffix}"
+    if out.exists():
+        return out
+
+    try:
+        with Image.open(source) as im:
+            im.thumbnail((pixels, pixels * 4))
+            out.parent.mkdir(parents=True, exist_ok=True)
+            tmp = out.with_name(out.name + ".tmp")
+            im.save(tmp, format=fmt)
+        os.replace(tmp, out)
+    except OSError:
+        return None
+    return out
+
+
+def build_thumbnails(sources, cache_dir: Path = THUMB_DIR) -> int:
+    """Build every THUMB_SCALES derivative of sources; returns files built."""
+    built = 0
+    for source in sources:
+        for scale in THUMB_SCALES:
+            if thumbnail(Path(source), scale=scale, cache_dir=cache_dir):
+                built += 1
+    return built
+
+
+def workbook_images(workbook: Path, sheets) -> list[Path]:
+    """Local image files referenced by the 'Image' column of the sheets."""
+    found = []
+    for df in read_sheets(workbook, sheets, columns=["Image"]).values():
+        if "Image" not in df.columns:
+            continue
+        for ref in df["Image"].str.strip():
+            if ref and not ref.lower().startswith(("http://", "https://")):
+                path = workbook.parent / ref
+                if path.is_file():
+                    found.append(path)
+    return found
+
+
+if __name__ == "__main__":
+    workbook = Path(sys.argv[1]) if len(sys.argv) > 1 else DATA_XLSX
+    images = workbook_images(workbook, [SHEET_SUN, SHEET_CLO])
+    print(f"{build_thumbnails(images)} thumbnails for {len(images)} images "
+          f"in {THUMB_DIR}")
@@ -0,0 +1,9 @@
+"""Keep the on-disk caches of every test out of the repo's .cache."""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def cache_dirs(monkeypatch, tmp_path):
+    monkeypatch.setattr("catalogue.loader.CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr("catalogue.search.SEARCH_DIR", tmp_path / "search")
@@ -0,0 +1,31 @@
+"""Comparison figures."""
+
+import numpy as np
+import pandas as pd
+
+from catalogue.charts import SUN_CHARTS, combined_metric_figure
+
+
+def comparison() -> pd.DataFrame:
+    df = pd.DataFrame({"Product": ["A", "B", "C"], "Key": ["k1", "k2", "k3"]})
+    for i, (col, *_) in enumerate(SUN_CHARTS):
+        df[col] = [1.0 + i, 2.0, 3.0]
+    df.loc[0, SUN_CHARTS[0][0]] = np.nan       # A has no value in chart 1
+    df.loc[1, [c[0] for c in SUN_CHARTS]] = np.nan   # B has none at all
+    return df
+
+
+def test_every_drawn_product_is_in_the_legend_once():
+    fig = combined_metric_figure(comparison(), SUN_CHARTS)
+    shown = [t.name for t in fig.data if t.showlegend]
+    assert sorted(shown) == ["A", "C"]
+    assert {t.name for t in fig.data} == {"A", "C"}
+
+
+def test_traces_of_a_product_share_a_colour():
+    fig = combined_metric_figure(comparison(), SUN_CHARTS)
+    colours = {}
+    for t in fig.data:
+        colours.setdefault(t.name, set()).add(t.marker.color)
+    assert all(len(c) == 1 for c in colours.values())
+
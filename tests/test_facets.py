@@ -0,0 +1,73 @@
+"""Facet counts: bincount over codes, and incremental FacetCounts updates."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalogue.facets import FacetCounts, FacetIndex, band_names
+from catalogue.schema import add_typed_columns, schema_for
+from catalogue.synth import catalogue
+
+
+@pytest.fixture(params=[("Sunscreens", "sun"), ("Clothing", "cloth")])
+def sheet(request):
+    name, kind = request.param
+    df = add_typed_columns(catalogue(1500, seed=2)[name], schema_for(kind))
+    return df, FacetIndex(df, kind)
+
+
+def test_counts_match_value_counts(sheet):
+    df, index = sheet
+    rows = np.flatnonzero(np.random.default_rng(0).random(len(df)) < 0.3)
+    counts = index.counts(rows)
+    for f in index.facets:
+        if f.bands:
+            continue
+        text = df[f.column].iloc[rows].astype(str).str.strip()
+        want = text[~text.str.lower().isin(["", "nan", "na", "n/a", "none"])]
+        got = dict(zip(index.names[f.title], counts[f.title]))
+        assert {k: v for k, v in got.items() if v} == \
+            want.value_counts().to_dict()
+
+
+def test_bands_match_cut(sheet):
+    df, index = sheet
+    band = next(f for f in index.facets if f.bands)
+    spf = df[band.column + " __num"]
+    want = pd.cut(spf, [-np.inf, *band.bands, np.inf], right=False,
+                  labels=band_names(band.bands)).value_counts(sort=False)
+    assert index.totals[band.title].tolist() == want.tolist()
+
+
+def test_incremental_updates_match_recounts(sheet):
+    df, index = sheet
+    counts = FacetCounts(index)
+    rng = np.random.default_rng(1)
+    rows = None
+    for step in range(60):
+        if step % 10 == 0:
+            rows = None
+        elif rows is None or rng.random() < 0.2:
+            rows = np.flatnonzero(rng.random(len(df)) < rng.random())
+        else:
+            # A filter tightened or relaxed: a few rows leave or enter
+            flip = rng.choice(len(df), 20, replace=False)
+            rows = np.setxor1d(rows, flip)
+        got = counts.update(rows)
+        want = index.counts(rows)
+        assert set(got) == set(want)
+        for title in want:
+            assert np.array_equal(got[title], want[title]), (step, title)
+
+
+def test_top_orders_values_by_count_and_bands_by_band(sheet):
+    df, index = sheet
+    top = index.top(index.totals, n=3)
+    for f in index.facets:
+        found = [count for _, count in top[f.title]]
+        if f.bands:
+            assert [name for name, _ in top[f.title]] == [
+                name for name, c in zip(band_names(f.bands),
+                                        index.totals[f.title]) if c]
+        else:
+            assert len(found) <= 3 and found == sorted(found, reverse=True)
@@ -0,0 +1,80 @@
+"""IngredientIndex bitmap filters against a row-by-row text scan."""
+
+import re
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalogue.ingredients import INCI_ALIASES, IngredientIndex
+from catalogue.synth import catalogue
+
+
+def listed(cell: str) -> set[str]:
+    """Normalised ingredient names in one cell, scanned as plain text."""
+    names = set()
+    for part in re.split(r"[,;\n]", str(cell).lower()):
+        part = re.sub(r"\([^)]*\)|\d+(?:\.\d+)?\s*%", " ", part)
+        part = " ".join(part.split()).strip(" .*")
+        if part and part not in {"nan", "etc", "and more", "others"}:
+            names.add(INCI_ALIASES.get(part, part))
+    return names
+
+
+def scan(cells, any_of=(), all_of=(), none_of=()) -> np.ndarray:
+    norm = [INCI_ALIASES.get(n.lower(), n.lower()) for n in any_of]
+    need = [INCI_ALIASES.get(n.lower(), n.lower()) for n in all_of]
+    avoid = [INCI_ALIASES.get(n.lower(), n.lower()) for n in none_of]
+    rows = []
+    for i, cell in enumerate(cells):
+        names = listed(cell)
+        if any_of and not names & set(norm):
+            continue
+        if not set(need) <= names:
+            continue
+        if none_of and (not names or names & set(avoid)):
+            continue
+        rows.append(i)
+    return np.array(rows, dtype=np.int64)
+
+
+@pytest.fixture(scope="module")
+def cells():
+    cells = catalogue(800, seed=4)["Sunscreens"]["Ingredients List"]
+    extra = pd.Series(["", "Zinc oxide (nano) 20%; Avobenzone", "N/A",
+                       "Aqua\nTinosorb S.\nOctocrylene*"])
+    return pd.concat([cells, extra], ignore_index=True)
+
+
+FILTERS = [
+    {"any_of": ["zinc oxide"]},
+    {"any_of": ["zinc oxide", "tinosorb s"], "none_of": ["octocrylene"]},
+    {"all_of": ["aqua", "butyl methoxydibenzoylmethane"]},
+    {"none_of": ["parfum", "alcohol denat"]},
+    {"any_of": ["Avobenzone"], "all_of": ["Titanium Dioxide"]},
+    {"any_of": ["not an ingredient"]},
+    {"none_of": ["not an ingredient"]},
+    {},
+]
+
+
+@pytest.mark.parametrize("query", FILTERS)
+def test_match_equals_text_scan(cells, query):
+    index = IngredientIndex(pd.DataFrame({"Ingredients List": cells}))
+    assert np.array_equal(index.match(**query), scan(cells, **query))
+
+
+def test_counts_equal_text_scan(cells):
+    index = IngredientIndex(pd.DataFrame({"Ingredients List": cells}))
+    scanned = [listed(c) for c in cells]
+    for name in index.names[:40]:
+        assert index.count(name) == sum(name in s for s in scanned)
+    assert index.count("Tinosorb S") == index.count(
+        "bis-ethylhexyloxyphenol methoxyphenyl triazine")
+
+
+def test_sheet_without_ingredients_column():
+    index = IngredientIndex(pd.DataFrame({"Product Name": ["a", "b"]}))
+    assert index.names == []
+    assert index.match(any_of=["zinc oxide"]).tolist() == []
+    assert index.match().tolist() == [0, 1]
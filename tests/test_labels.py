@@ -0,0 +1,50 @@
+"""Row keys and dropdown labels."""
+
+import pandas as pd
+import pytest
+
+from catalogue.labels import ID_COL, make_keys, make_labels, unique_labels
+from catalogue.synth import catalogue
+
+
+def rows(*records) -> pd.DataFrame:
+    return pd.DataFrame(records, columns=["Product Brand", "Product Name",
+                                          "Volume (ml)", ID_COL])
+
+
+def test_id_is_the_key_and_repeats_are_numbered():
+    df = rows(["A", "x", "50", "B1"], ["B", "y", "50", "B1"],
+              ["C", "z", "50", " B2 "])
+    assert make_keys(df).tolist() == ["B1", "B1#2", "B2"]
+
+
+@pytest.mark.parametrize("token", ["", "N/A", "na", "None", "nan", " n/a "])
+def test_missing_ids_fall_back_to_the_content_hash(token):
+    df = rows(["A", "x", "50", token], ["B", "y", "50", token])
+    keys = make_keys(df)
+    assert keys.str.startswith("h:").all() and keys.is_unique
+
+
+def test_keys_do_not_depend_on_other_rows():
+    df = catalogue(2000, seed=5)["Sunscreens"]
+    keys = pd.Series(make_keys(df).to_numpy(), index=df.index)
+    new = rows(["New", "Product", "30", "N/A"]).reindex(columns=df.columns,
+                                                       fill_value="")
+    grown = pd.concat([new, df], ignore_index=True)
+    moved = make_keys(grown).iloc[1:].to_numpy()
+    # Only repeats of the inserted row's key could be renumbered
+    assert (moved == keys.to_numpy()).all()
+
+
+def test_keys_of_a_header_only_sheet():
+    assert make_keys(rows()).empty
+
+
+def test_labels_and_their_fallback():
+    df = rows(["Brand", "Name", "50", ""], ["", "", "", "B9"],
+              ["Brand", "Name", "50", ""])
+    labels = make_labels(df, "sun")
+    assert labels.tolist() == ["Brand — Name — 50 ml", "B9",
+                               "Brand — Name — 50 ml"]
+    shown = unique_labels(labels, make_keys(df))
+    assert shown.is_unique and shown[1] == "B9"
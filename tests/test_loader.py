@@ -0,0 +1,96 @@
+"""Workbook readers: every engine reads a sheet as pd.read_excel would."""
+
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from catalogue.loader import (
+    ENGINE_CALAMINE,
+    ENGINE_PANDAS,
+    ENGINE_STREAM,
+    default_engine,
+    read_sheets,
+    read_sheets_streaming,
+)
+
+HEADER = ["Product Name", "SPF (lab)", None, "Price (£)", "Price (£)",
+          "Date of Entry", "Notes"]
+ROWS = [
+    ["Sun A", 50, None, 12.5, 3, datetime(2024, 1, 2), "N/A"],
+    ["Sun B", "30+", "x", 0.1, 7.0, "02/01/2024", ""],
+    [None, None, None, None, None, None, None],     # blank row inside
+    ["Sun C", "12%", None, -1, 1e-05, None, "nan"],
+    ["Ünïcode", 1.0, None, 3, True, None, "NULL"],
+    [None] * 7,                                     # trailing blank rows
+    [None] * 7,
+]
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sunscreens"
+    ws.append(HEADER)
+    for row in ROWS:
+        ws.append(row)
+    empty = wb.create_sheet("Clothing")
+    empty.append(["Product Name", "Material"])
+    path = tmp_path / "edge.xlsx"
+    wb.save(path)
+    return path
+
+
+def expected(path, sheet, columns=None):
+    df = pd.read_excel(path, sheet_name=sheet, dtype=str).fillna("")
+    df.columns = [str(c) for c in df.columns]
+    if columns is not None:
+        df = df[[c for c in df.columns if c in columns]]
+    return df
+
+
+def assert_same_text(got: pd.DataFrame, want: pd.DataFrame):
+    assert list(got.columns) == list(want.columns)
+    assert len(got) == len(want)
+    for col in want.columns:
+        assert got[col].astype(str).tolist() == want[col].astype(str).tolist(), col
+
+
+def test_streaming_matches_read_excel(workbook):
+    frames = read_sheets_streaming(workbook, ["Sunscreens", "Clothing"])
+    assert_same_text(frames["Sunscreens"], expected(workbook, "Sunscreens"))
+    assert_same_text(frames["Clothing"], expected(workbook, "Clothing"))
+    assert frames["Clothing"].empty
+
+
+def test_streaming_keeps_only_requested_columns(workbook):
+    columns = ["Product Name", "Price (£)", "Notes"]
+    frames = read_sheets_streaming(workbook, ["Sunscreens"], columns)
+    assert_same_text(frames["Sunscreens"],
+                     expected(workbook, "Sunscreens", columns))
+
+
+def test_missing_sheet_is_left_out(workbook):
+    frames = read_sheets_streaming(workbook, ["Sunscreens", "Hats"])
+    assert list(frames) == ["Sunscreens"]
+
+
+@pytest.mark.parametrize("engine", [ENGINE_PANDAS, ENGINE_STREAM,
+                                    ENGINE_CALAMINE])
+def test_read_sheets_engines_agree(workbook, engine, monkeypatch, tmp_path):
+    if engine == ENGINE_CALAMINE and default_engine() != ENGINE_CALAMINE:
+        pytest.skip("python-calamine is not installed")
+    monkeypatch.setattr("catalogue.loader.CACHE_DIR", tmp_path / "cache")
+    frames = read_sheets(workbook, ["Sunscreens", "Clothing"], engine=engine)
+    assert_same_text(frames["Sunscreens"], expected(workbook, "Sunscreens"))
+    assert frames["Clothing"].empty
+
+
+def test_sidecar_returns_the_same_frames(workbook, monkeypatch, tmp_path):
+    monkeypatch.setattr("catalogue.loader.CACHE_DIR", tmp_path / "cache")
+    first = read_sheets(workbook, ["Sunscreens"], engine=ENGINE_STREAM)
+    again = read_sheets(workbook, ["Sunscreens"], engine=ENGINE_STREAM)
+    assert list((tmp_path / "cache").glob("*.arrow"))
+    assert_same_text(again["Sunscreens"], first["Sunscreens"])
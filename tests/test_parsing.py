@@ -0,0 +1,46 @@
+"""to_float_series against the scalar to_float, cell by cell."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalogue.parsing import to_date_series, to_float, to_float_series
+from catalogue.synth import catalogue
+
+EDGE_CELLS = ["50", "50+", "12%", " 30 ", "N/A", "na", "None", "", "abc",
+              "1e-3", "-4.5", "0", "nan", "12%+", "+", "%", "1,000"]
+
+
+def scalar(values) -> np.ndarray:
+    parsed = [to_float(v) for v in values]
+    return np.array([np.nan if v is None else v for v in parsed])
+
+
+def test_edge_cells():
+    got = to_float_series(pd.Series(EDGE_CELLS))
+    assert np.array_equal(got.to_numpy(), scalar(EDGE_CELLS), equal_nan=True)
+    assert got.tolist()[:4] == [50.0, 50.0, 12.0, 30.0]
+    assert to_float(None) is None and to_float(12) == 12.0
+
+
+@pytest.mark.parametrize("name", ["Sunscreens", "Clothing"])
+def test_series_matches_scalar_on_every_column(name):
+    df = catalogue(1000, seed=6)[name]
+    for col in df.columns:
+        got = to_float_series(df[col])
+        assert got.dtype == "float64"
+        assert got.index.equals(df.index)
+        assert np.array_equal(got.to_numpy(), scalar(df[col]),
+                              equal_nan=True), col
+
+
+def test_empty_column():
+    got = to_float_series(pd.Series([], dtype=str))
+    assert got.dtype == "float64" and got.empty
+
+
+def test_dates_iso_and_day_first():
+    got = to_date_series(pd.Series(["2024-01-02", "03/04/2024", "N/A", "x"]))
+    assert got.iloc[0] == pd.Timestamp("2024-01-02")
+    assert got.iloc[1] == pd.Timestamp("2024-04-03")
+    assert got.iloc[2:].isna().all()
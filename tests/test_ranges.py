@@ -0,0 +1,74 @@
+"""SortedIndex range selections against a plain boolean mask."""
+
+import numpy as np
+import pytest
+
+from catalogue.ranges import SortedIndex
+
+METRICS = ["spf", "price", "volume"]
+
+
+@pytest.fixture
+def index():
+    rng = np.random.default_rng(0)
+    n = 2000
+    values = {
+        "spf": rng.choice([15.0, 30.0, 50.0, 50.0, 100.0], n),   # many ties
+        "price": np.round(rng.uniform(0, 2, n), 2),
+        "volume": rng.choice([30.0, 50.0, 100.0, 200.0], n),
+    }
+    for v in values.values():
+        v[rng.random(n) < 0.1] = np.nan                        # missing
+    return SortedIndex(values, n)
+
+
+def mask_rows(index: SortedIndex, bounds: dict) -> np.ndarray:
+    keep = np.ones(index.size, dtype=bool)
+    for metric, (low, high) in bounds.items():
+        v = index.values[metric]
+        if low is not None:
+            keep &= v >= low
+        if high is not None:
+            keep &= v <= high
+        if low is not None or high is not None:
+            keep &= ~np.isnan(v)
+    return np.flatnonzero(keep)
+
+
+def random_bounds(rng) -> dict:
+    bounds = {}
+    for metric, (lo, hi) in zip(METRICS, [(0, 120), (0, 2), (0, 250)]):
+        low, high = sorted(rng.uniform(lo, hi, 2))
+        bounds[metric] = (low if rng.random() < 0.6 else None,
+                          high if rng.random() < 0.6 else None)
+    return bounds
+
+
+def test_select_matches_mask(index):
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        bounds = random_bounds(rng)
+        got = index.select(bounds)
+        if all(b == (None, None) for b in bounds.values()):
+            assert got is None
+        else:
+            assert np.array_equal(got, mask_rows(index, bounds)), bounds
+
+
+def test_bounds_are_inclusive_and_exact_on_ties(index):
+    bounds = {"spf": (50, 50), "volume": (None, 50)}
+    assert np.array_equal(index.select(bounds), mask_rows(index, bounds))
+    assert len(index.select({"spf": (50, 50)})) == np.sum(
+        index.values["spf"] == 50)
+
+
+def test_empty_and_inverted_ranges(index):
+    assert len(index.select({"price": (5, None)})) == 0
+    assert len(index.select({"price": (1.5, 0.5)})) == 0
+
+
+def test_within_is_in_value_order(index):
+    rows = index.within("price", 0.5, 1.0)
+    values = index.values["price"][rows]
+    assert np.all(np.diff(values) >= 0)
+    assert set(rows) == set(mask_rows(index, {"price": (0.5, 1.0)}))
@@ -0,0 +1,71 @@
+"""RankIndex top-N against scoring and sorting every row."""
+
+import numpy as np
+import pytest
+
+from catalogue.ranking import RankIndex
+from catalogue.schema import add_typed_columns, schema_for
+from catalogue.synth import catalogue
+
+
+@pytest.fixture(scope="module", params=[("Sunscreens", "sun"),
+                                        ("Clothing", "cloth")])
+def index(request):
+    name, kind = request.param
+    df = add_typed_columns(catalogue(1500, seed=9)[name], schema_for(kind))
+    return RankIndex(df, kind)
+
+
+def percentile(values: np.ndarray, lower_is_better: bool) -> np.ndarray:
+    """Average-rank percentile of each value among the present ones; 0 if missing."""
+    present = values[~np.isnan(values)]
+    out = np.zeros(len(values))
+    for i, v in enumerate(values):
+        if np.isnan(v):
+            continue
+        better = present > v if lower_is_better else present < v
+        out[i] = (better.sum() + ((present == v).sum() + 1) / 2) / len(present)
+    return out
+
+
+def brute_top(index: RankIndex, weights, thresholds, n):
+    score = index.score(weights)
+    keep = np.ones(index.size, dtype=bool)
+    for metric, (low, high) in thresholds.items():
+        v = index.values[metric]
+        if low is not None:
+            keep &= v >= low
+        if high is not None:
+            keep &= v <= high
+    rows = sorted(np.flatnonzero(keep), key=lambda r: (-score[r], r))[:n]
+    return np.array(rows, dtype=np.int64), score[rows]
+
+
+def test_scores_are_percentiles(index):
+    for c in index.criteria:
+        assert np.allclose(index.scores[c.metric],
+                           percentile(index.values[c.metric],
+                                      c.lower_is_better))
+
+
+QUERIES = [
+    ({"SPF_lab (UVB)": 1}, {}, 10),                       # many ties
+    ({"SPF_lab (UVB)": 1}, {}, 500),
+    ({"SPF_lab (UVB)": 2, "UVA_PF_lab": 1}, {"SPF_lab (UVB)": (30, None)}, 10),
+    ({"UVA_PF_lab": 1, "price": 1}, {"UVA_PF_lab": (None, 20)}, 25),
+    ({"SPF_lab (UVB)": 0}, {}, 5),                        # all scores 0
+    ({"SPF_lab (UVB)": 1}, {"SPF_lab (UVB)": (1000, None)}, 10),   # nothing
+    ({"SPF_lab (UVB)": 1}, {}, 100000),                   # n > rows
+]
+
+
+@pytest.mark.parametrize("weights, thresholds, n", QUERIES)
+def test_top_equals_sorted_brute_force(index, weights, thresholds, n):
+    # "price" is the sheet's lower-is-better criterion
+    price = next(c.metric for c in index.criteria if c.lower_is_better)
+    weights = {price if m == "price" else m: w for m, w in weights.items()}
+    rows, scores = index.top(weights, thresholds, n)
+    want_rows, want_scores = brute_top(index, weights, thresholds, n)
+    assert np.array_equal(rows, want_rows)
+    assert np.array_equal(scores, want_scores)
+
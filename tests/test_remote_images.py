@@ -0,0 +1,138 @@
+"""ImageFetcher against a local HTTP stand-in."""
+
+import io
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from PIL import Image
+
+from catalogue.remote_images import ImageFetcher
+
+ETAG = '"v1"'
+
+
+def png_bytes() -> bytes:
+    out = io.BytesIO()
+    Image.new("RGB", (4, 4), (255, 0, 0)).save(out, format="PNG")
+    return out.getvalue()
+
+
+PNG = png_bytes()
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    /image.png (with ETag), /missing.png (404), /page (not an image) and
+    /replaced.png (an image once, then a page).
+    """
+    served = []
+
+    def do_GET(self):
+        if self.path == "/image.png":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.reply(304)
+            else:
+                self.reply(200, PNG, "image/png", {"ETag": ETAG})
+        elif self.path == "/replaced.png" and not any(
+                path == self.path for path, _ in self.served):
+            self.reply(200, PNG, "image/png")
+        elif self.path in ("/page", "/replaced.png"):
+            self.reply(200, b"<html>not an image</html>", "text/html")
+        else:
+            self.reply(404, b"not found", "text/plain")
+
+    def reply(self, status, body=b"", content_type=None, headers=None):
+        self.served.append((self.path, status))
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    Handler.served = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def closed_port() -> int:
+    """A local port nothing listens on, so connecting is refused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_fetch_caches_image(server, tmp_path):
+    fetcher = ImageFetcher(tmp_path, timeout=2)
+    path = fetcher.fetch(f"{server}/image.png")
+    assert path is not None and path.read_bytes() == PNG
+    assert fetcher.fetch(f"{server}/image.png") == path
+    assert Handler.served == [("/image.png", 200)]  # second call is fresh
+
+
+def test_stale_entry_revalidates_with_304(server, tmp_path):
+    fetcher = ImageFetcher(tmp_path, timeout=2, max_age=0)
+    first = fetcher.fetch(f"{server}/image.png")
+    again = fetcher.fetch(f"{server}/image.png")
+    assert again == first and again.read_bytes() == PNG
+    assert Handler.served == [("/image.png", 200), ("/image.png", 304)]
+
+
+def test_http_error_is_none(server, tmp_path):
+    assert ImageFetcher(tmp_path, timeout=2).fetch(f"{server}/missing.png") is None
+
+
+def test_non_image_body_is_none(server, tmp_path):
+    fetcher = ImageFetcher(tmp_path, timeout=2)
+    assert fetcher.fetch(f"{server}/page") is None
+    assert not list(tmp_path.iterdir())
+
+
+def test_refused_connection_is_none(tmp_path):
+    url = f"http://127.0.0.1:{closed_port()}/image.png"
+    assert ImageFetcher(tmp_path, timeout=2).fetch(url) is None
+
+
+def test_refused_revalidation_keeps_cached_copy(server, tmp_path):
+    fetcher = ImageFetcher(tmp_path, timeout=2, max_age=0)
+    url = f"{server}/image.png"
+    cached = fetcher.fetch(url)
+    # Same cache entry, but the server is gone
+    gone = f"http://127.0.0.1:{closed_port()}/image.png"
+    body, meta = fetcher._paths(url)
+    moved, moved_meta = fetcher._paths(gone)
+    moved.write_bytes(body.read_bytes())
+    moved_meta.write_text(meta.read_text())
+    assert fetcher.fetch(gone) == moved
+    assert cached.read_bytes() == PNG
+
+
+def test_non_image_revalidation_keeps_cached_copy(server, tmp_path):
+    fetcher = ImageFetcher(tmp_path, timeout=2, max_age=0)
+    cached = fetcher.fetch(f"{server}/replaced.png")
+    assert fetcher.fetch(f"{server}/replaced.png") == cached
+    assert cached.read_bytes() == PNG
+    assert Handler.served == [("/replaced.png", 200)] * 2
+
+
+def test_fetch_all_resolves_each_url_once(server, tmp_path):
+    urls = [f"{server}/image.png", f"{server}/missing.png",
+            f"{server}/image.png"]
+    found = ImageFetcher(tmp_path, timeout=2).fetch_all(urls)
+    assert list(found) == urls[:2]
+    assert found[urls[0]] is not None and found[urls[1]] is None
+    assert Handler.served.count(("/image.png", 200)) == 1
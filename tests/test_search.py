@@ -0,0 +1,90 @@
+"""SearchIndex against a word-by-word scan, and its saved copies."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import catalogue.search as search
+from catalogue.search import SEARCH_COLUMNS, SearchIndex, sheet_index, tokenize
+from catalogue.synth import catalogue
+
+
+@pytest.fixture(scope="module")
+def sheet():
+    return catalogue(600, seed=8)["Sunscreens"].astype(str)
+
+
+def scan(df: pd.DataFrame, query: str) -> np.ndarray:
+    """Rows where every query word starts some word of a search column."""
+    columns = [c for c in SEARCH_COLUMNS if c in df.columns]
+    rows = []
+    for i, cells in enumerate(df[columns].itertuples(index=False)):
+        words = set(tokenize(" ".join(cells)))
+        if all(any(w.startswith(q) for w in words) for q in tokenize(query)):
+            rows.append(i)
+    return np.array(rows, dtype=np.int64)
+
+
+QUERIES = ["", "zinc", "octo meth", "La Roche", "spf 50", "Ti", "aqua zinc",
+           "tinosorb s", "zzzz", "50", "a"]
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_prefix_search_equals_scan(sheet, query):
+    index = SearchIndex.build(sheet)
+    assert np.array_equal(index.search(query, fuzzy=False), scan(sheet, query))
+
+
+def test_save_load_round_trip(sheet, tmp_path):
+    index = SearchIndex.build(sheet)
+    index.save(tmp_path / "index.npz")
+    loaded = SearchIndex.load(tmp_path / "index.npz")
+    assert loaded.terms == index.terms and loaded.size == index.size
+    assert loaded.names.terms == index.names.terms
+    assert loaded.names.trigrams.grams == index.names.trigrams.grams
+    for query in [*QUERIES, "nivia", "posey"]:
+        assert np.array_equal(loaded.search(query), index.search(query))
+
+
+def test_sources_keep_their_own_saved_index(sheet):
+    sheet_index(sheet, "sun", "v1", "/data/catalogue.xlsx")
+    sheet_index(sheet, "sun", "v1", "/data/sunscreens.csv")
+    sheet_index(sheet.iloc[:-1], "sun", "v2", "/data/catalogue.xlsx")
+    saved = sorted(p.name for p in search.SEARCH_DIR.glob("*.npz"))
+    assert len(saved) == 2
+    assert search.index_file(sheet, "sun", "v1", "/data/sunscreens.csv"
+                             ).name in saved
+    assert search.index_file(sheet.iloc[:-1], "sun", "v2",
+                             "/data/catalogue.xlsx").name in saved
+
+
+@pytest.mark.parametrize("word, term", [("nivia", "nivea"),
+                                        ("posey", "posay"),
+                                        ("neutrogina", "neutrogena")])
+def test_fuzzy_lookup_of_brand_typos(sheet, word, term):
+    index = SearchIndex.build(sheet)
+    assert not len(index.prefix_rows(word))
+    assert term in index.fuzzy_terms(word)
+    assert np.array_equal(index.search(word), index.prefix_rows(term))
+    assert index.corrections(f"spf {word}") == {word: index.fuzzy_terms(word)}
+
+
+def test_fuzzy_terms_equal_brute_force(sheet):
+    index = SearchIndex.build(sheet)
+    terms = index.names.terms
+    rng = np.random.default_rng(3)
+    for term in rng.choice([t for t in terms if len(t) >= 4], 60):
+        i = rng.integers(len(term))
+        for word in [term[:i] + term[i + 1:], term[:i] + "x" + term[i + 1:],
+                     term[:i] + "qz" + term[i:]]:
+            edits = search.max_edits(word)
+            dist = {t: search.edit_distance(word, t, edits) for t in terms}
+            best = min(dist.values())
+            want = sorted(t for t, d in dist.items() if d == best <= edits)
+            assert sorted(index.fuzzy_terms(word)) == want, word
+
+
+def test_short_words_are_not_fuzzy(sheet):
+    index = SearchIndex.build(sheet)
+    assert index.fuzzy_terms("nvi") == []
+    assert index.search("qqq").tolist() == []
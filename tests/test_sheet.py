@@ -0,0 +1,110 @@
+"""SheetData: incremental re-ingest, empty sheets and per-sheet failures."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from catalogue.schema import add_typed_columns, schema_for
+from catalogue.sheet import SheetData, build_sheet, load_each, update_sheet
+from catalogue.synth import catalogue
+
+KINDS = {"Sunscreens": "sun", "Clothing": "cloth"}
+
+
+def full(raw: pd.DataFrame, kind: str) -> SheetData:
+    return build_sheet(add_typed_columns(raw, schema_for(kind)), kind, "v2")
+
+
+def assert_same_sheet(got: SheetData, want: SheetData):
+    pd.testing.assert_frame_equal(got.df, want.df)
+    pd.testing.assert_series_equal(got.keys, want.keys)
+    pd.testing.assert_series_equal(got.labels, want.labels)
+    assert got.positions == want.positions
+    assert np.array_equal(got.hashes, want.hashes)
+    pd.testing.assert_frame_equal(got.issues, want.issues)
+
+
+@pytest.fixture(params=list(KINDS))
+def sheet(request):
+    """(raw frame with some invalid cells, kind) for each sheet."""
+    raw = catalogue(300, seed=3)[request.param].astype(str)
+    raw.loc[::25, "SPF (lab)"] = "abc"          # issues to carry over
+    assert len(full(raw, KINDS[request.param]).issues)
+    return raw, KINDS[request.param]
+
+
+def edits(raw: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(1)
+    rows = rng.choice(len(raw), 20, replace=False)
+    edited = raw.copy()
+    edited.loc[rows, "SPF (lab)"] = ["x", "", "999999", "30"] * 5
+    edited.loc[rows[:5], "Product Name"] = "Renamed"
+    return {
+        "edit": edited,
+        "delete": raw.drop(index=rows).reset_index(drop=True),
+        "append": pd.concat([raw, raw.head(10)], ignore_index=True),
+        "reorder": raw.iloc[rng.permutation(len(raw))].reset_index(drop=True),
+        "everything": pd.concat([edited.iloc[rng.permutation(len(raw))],
+                                 raw.head(7)])
+                        .drop(index=rows[:3]).reset_index(drop=True),
+    }
+
+
+@pytest.mark.parametrize("case", ["edit", "delete", "append", "reorder",
+                                  "everything"])
+def test_update_sheet_matches_build_sheet(sheet, case):
+    raw, kind = sheet
+    new = edits(raw)[case]
+    assert_same_sheet(update_sheet(full(raw, kind), new, kind, "v2"),
+                      full(new, kind))
+
+
+def test_update_sheet_with_repeated_rows(sheet):
+    raw, kind = sheet
+    grown = edits(raw)["append"]                 # 10 rows appear twice
+    previous = update_sheet(full(raw, kind), grown, kind, "v2")
+    rng = np.random.default_rng(5)
+    new = (grown.iloc[rng.permutation(len(grown))]
+           .drop(index=[3, 4]).reset_index(drop=True))
+    assert_same_sheet(update_sheet(previous, new, kind, "v2"), full(new, kind))
+
+
+def test_unchanged_sheet_keeps_its_indexes(sheet):
+    raw, kind = sheet
+    previous = full(raw, kind).warm()
+    same = update_sheet(previous, raw.copy(), kind, "v3")
+    assert same.version == "v3" and previous.version == "v2"
+    for name in SheetData.INDEXES:
+        assert getattr(same, name) is getattr(previous, name)
+
+
+@pytest.mark.parametrize("kind", ["sun", "cloth"])
+def test_header_only_sheet(kind):
+    columns = catalogue(5)["Clothing" if kind == "cloth" else "Sunscreens"]
+    raw = columns.iloc[:0].astype(str)
+    sheet = full(raw, kind).warm()
+    assert sheet.empty and sheet.keys.empty and sheet.issues.empty
+    assert len(sheet.ranges.select({"UVA_PF_lab": (1, None)})) == 0
+    assert len(sheet.search.search("sun")) == 0
+    assert sheet.facets.top(sheet.facets.totals) == {
+        f.title: [] for f in sheet.facets.facets}
+    assert_same_sheet(update_sheet(sheet, raw, kind, "v2"), sheet)
+
+
+def test_load_each_isolates_a_failing_sheet():
+    good = build_sheet(catalogue(5)["Sunscreens"].astype(str), "sun")
+    old = build_sheet(catalogue(5)["Clothing"].astype(str), "cloth")
+
+    def broken():
+        raise ValueError("bad sheet")
+
+    builders = {"Sunscreens": lambda: good, "Clothing": broken}
+    errors = {}
+    loaded = load_each(builders, {"Clothing": old}, errors)
+    assert loaded["Sunscreens"] is good and loaded["Clothing"] is old
+    assert errors == {"Clothing": "ValueError: bad sheet"}
+
+    errors = {}
+    assert list(load_each(builders, {}, errors)) == ["Sunscreens"]
+    with pytest.raises(ValueError):
+        load_each(builders, {})
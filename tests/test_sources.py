@@ -0,0 +1,34 @@
+"""CSV exports mapped onto the workbook's headers."""
+
+import numpy as np
+
+from catalogue.sources import CsvColumn, CsvSource, read_csv
+
+
+def test_read_csv_maps_scales_and_joins(tmp_path):
+    path = tmp_path / "export.csv"
+    path.write_text("id,hev,kind,note,unused\n"
+                    "a,35,Organic,Blocks HEV,x\n"
+                    "b,n/a,,Low,y\n"
+                    "c,12%,Mixed,,z\n", encoding="utf-8")
+    df = read_csv(path, [
+        CsvColumn("id", "ID"),
+        CsvColumn("hev", "Blue", scale=0.01),
+        CsvColumn("kind", "Claims", prefix="Filters: "),
+        CsvColumn("note", "Claims"),
+        CsvColumn("missing", "Empty"),
+    ])
+    assert list(df.columns) == ["ID", "Blue", "Claims", "Empty"]
+    assert df["Blue"].tolist() == ["0.35", "", "0.12"]
+    assert df["Claims"].tolist() == ["Filters: Organic; Blocks HEV", "Low",
+                                     "Filters: Mixed"]
+    assert (df["Empty"] == "").all()
+
+
+def test_bundled_exports_keep_their_notes():
+    sheets = CsvSource().load()
+    sun, cloth = sheets["Sunscreens"], sheets["Clothing"]
+    assert sun.df["Any Additional Claims"].str.contains("HEV/VIS").all()
+    assert cloth.df["Any Additional Claims"].str.contains("UPF").all()
+    assert np.array_equal(sun.search.search("mineral"), [0])
+    assert np.array_equal(cloth.search.search("inexpensive"), [0])
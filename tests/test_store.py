@@ -0,0 +1,118 @@
+"""CatalogueStore: reloads on change, failed reloads and the watcher."""
+
+import os
+import time
+
+import pytest
+
+from catalogue import sheet
+from catalogue.sources import WorkbookSource
+from catalogue.store import CatalogueStore
+from catalogue.synth import catalogue, write_catalogue
+
+
+def write(path, n_rows: int, seed: int = 1):
+    """Write a workbook and move its mtime on, so a rewrite is always seen."""
+    write_catalogue(catalogue(n_rows, seed=seed), path)
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + n_rows * 10**9))
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    path = tmp_path / "catalogue.xlsx"
+    write(path, 20)
+    return path
+
+
+def test_first_load(workbook):
+    snap = CatalogueStore(WorkbookSource(workbook)).snapshot()
+    assert set(snap.sheets) == {"Sunscreens", "Clothing"}
+    assert not snap.error and not snap.errors
+    assert len(snap.sheets["Sunscreens"].df) == 20
+
+
+def test_refresh_only_when_files_change(workbook):
+    store = CatalogueStore(WorkbookSource(workbook))
+    first = store.snapshot()
+    assert not store.refresh()
+    assert store.snapshot() is first
+
+    write(workbook, 25)
+    assert store.refresh()
+    snap = store.snapshot()
+    assert snap.version != first.version and not snap.error
+    assert len(snap.sheets["Sunscreens"].df) == 25
+
+
+def test_failed_reload_keeps_previous_snapshot(workbook):
+    store = CatalogueStore(WorkbookSource(workbook))
+    good = store.snapshot()
+    workbook.write_bytes(b"not a workbook")
+    assert store.refresh()
+    snap = store.snapshot()
+    assert snap.error
+    assert snap.sheets is good.sheets and snap.version == good.version
+
+    write(workbook, 30)
+    assert store.refresh()
+    assert not store.snapshot().error
+    assert len(store.snapshot().sheets["Sunscreens"].df) == 30
+
+
+def test_missing_source_is_an_error(tmp_path):
+    snap = CatalogueStore(WorkbookSource(tmp_path / "none.xlsx")).snapshot()
+    assert snap.error and not snap.sheets
+
+
+def test_one_failing_sheet_keeps_its_previous_version(workbook, monkeypatch):
+    store = CatalogueStore(WorkbookSource(workbook))
+    old_cloth = store.snapshot().sheets["Clothing"]
+    update = sheet.update_sheet
+
+    def failing_cloth(previous, raw, kind, *args):
+        if kind == "cloth":
+            raise ValueError("bad clothing sheet")
+        return update(previous, raw, kind, *args)
+
+    monkeypatch.setattr(sheet, "update_sheet", failing_cloth)
+    write(workbook, 25)
+    assert store.refresh()
+    snap = store.snapshot()
+    assert not snap.error
+    assert snap.errors == {"Clothing": "ValueError: bad clothing sheet"}
+    assert snap.sheets["Clothing"] is old_cloth
+    assert len(snap.sheets["Sunscreens"].df) == 25
+
+    monkeypatch.setattr(sheet, "update_sheet", update)
+    write(workbook, 26)
+    assert store.refresh()
+    assert not store.snapshot().errors
+    assert len(store.snapshot().sheets["Clothing"].df) == 26
+
+
+def test_failing_warm_only_fails_that_sheet(workbook, monkeypatch):
+    warm = sheet.SheetData.warm
+
+    def failing_sun(self):
+        if self.kind == "sun":
+            raise MemoryError("no room for the indexes")
+        return warm(self)
+
+    monkeypatch.setattr(sheet.SheetData, "warm", failing_sun)
+    snap = CatalogueStore(WorkbookSource(workbook)).snapshot()
+    assert list(snap.sheets) == ["Clothing"]
+    assert snap.errors == {"Sunscreens": "MemoryError: no room for the indexes"}
+
+
+def test_watcher_thread_reloads_in_the_background(workbook):
+    store = CatalogueStore(WorkbookSource(workbook), interval=0.05).start()
+    try:
+        first = store.snapshot()
+        write(workbook, 22)
+        deadline = time.monotonic() + 30
+        while store.snapshot() is first and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(store.snapshot().sheets["Sunscreens"].df) == 22
+    finally:
+        store.stop()
+    assert not store._thread.is_alive()